@@ -0,0 +1,19 @@
+# Generated by Django 4.2.9 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["-creation_date", "-id"],
+                name="user_creation_date_id_idx",
+            ),
+        ),
+    ]
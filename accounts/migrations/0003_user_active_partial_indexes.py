@@ -0,0 +1,34 @@
+# Generated by Django 4.2.9 on 2026-10-18 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_user_creation_date_id_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("deleted", False), ("is_active", True)),
+                fields=["-creation_date", "-id"],
+                name="user_active_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("deleted", False), ("is_active", True)),
+                fields=["role", "-creation_date", "-id"],
+                name="user_active_role_idx",
+            ),
+        ),
+        # The users lists only show active users, the full index is replaced
+        # by the partial one.
+        migrations.RemoveIndex(
+            model_name="user",
+            name="user_creation_date_id_idx",
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import (
     BaseUserManager,
     AbstractBaseUser,
@@ -94,6 +95,20 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # Partial indexes for the active users lists, the lists never
+            # show the other rows.
+            models.Index(
+                fields=["-creation_date", "-id"],
+                name="user_active_created_idx",
+                condition=Q(is_active=True, deleted=False),
+            ),
+            models.Index(
+                fields=["role", "-creation_date", "-id"],
+                name="user_active_role_idx",
+                condition=Q(is_active=True, deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return self.first_name
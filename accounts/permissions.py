@@ -1,15 +1,52 @@
 from rest_framework import permissions
 
 
-class IsProjectManager(permissions.BasePermission):
+class MemoizedPermission(permissions.BasePermission):
+    """Permission whose checks run at most once per request
+
+    Composed permissions (IsAdminUser | IsProjectManager | ...) call
+    has_permission() again for every object check, so the results are kept
+    in a memo on the request. Subclasses implement check_permission() and
+    check_object_permission().
+    """
+
     def has_permission(self, request, view):
+        return self.memoize(
+            request, None, lambda: self.check_permission(request, view)
+        )
+
+    def has_object_permission(self, request, view, obj):
+        return self.memoize(
+            request,
+            (type(obj), obj.pk),
+            lambda: self.check_object_permission(request, view, obj),
+        )
+
+    def check_permission(self, request, view):
+        return True
+
+    def check_object_permission(self, request, view, obj):
+        return True
+
+    def memoize(self, request, obj_key, check):
+        memo = getattr(request, "permission_memo", None)
+        if memo is None:
+            memo = request.permission_memo = {}
+        key = (type(self), obj_key)
+        if key not in memo:
+            memo[key] = check()
+        return memo[key]
+
+
+class IsProjectManager(MemoizedPermission):
+    def check_permission(self, request, view):
         if request.user.is_authenticated is not True:
             return False
         return request.user.is_project_manager()
 
 
-class IsAuthenticatedAndIsOwner(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj):
+class IsAuthenticatedAndIsOwner(MemoizedPermission):
+    def check_object_permission(self, request, view, obj):
         if not request.user.is_authenticated:
             return False
-        return request.user.email == obj.email
+        return request.user.pk == obj.pk
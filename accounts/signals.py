@@ -1,14 +1,13 @@
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from api.cache import invalidate
 
 User = get_user_model()
 
 
 def clear_user_cache():
-    user_cache = cache.keys("*user*")
-    delete_cache = cache.delete_many(user_cache)
+    invalidate("users")
 
 
 @receiver(post_save, sender=User)
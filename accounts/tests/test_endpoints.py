@@ -69,6 +69,19 @@ class TestListCreateUser(APITestCase):
         response = self.client.get("/api/v1/accounts/users/")
         self.assertEqual(response.status_code, 200)
 
+    def test_get_request_with_page_size_returns_paginated_users(self):
+        response = self.client.get("/api/v1/accounts/users/?page_size=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(
+            response.data["results"][0]["email"], self.test_dev_user.email
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            response.data["results"][0]["email"], self.test_pm_user.email
+        )
+        self.assertIsNone(response.data["next"])
+
     def test_post_request_create_user_with_valid_data_returns_201(self):
         data = {
             "email": "camille@gmail.com",
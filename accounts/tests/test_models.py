@@ -1,5 +1,6 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.db.utils import IntegrityError
 from django.core.exceptions import ValidationError
 
@@ -179,3 +180,46 @@ class TestUser(TestCase):
             )
             new_user.full_clean()
             new_user.save()
+
+
+class TestUserPartialIndexes(TestCase):
+    """Test that the users lists querysets are resolved with partial indexes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(
+            [
+                User(
+                    email=f"user{i}@gmail.com",
+                    first_name="User",
+                    last_name="Seed",
+                    role="P" if i % 10 == 0 else "D",
+                    mobile_phone=f"+53 5000{i:04d}",
+                    password="!",
+                    is_active=i % 4 != 0,
+                )
+                for i in range(2000)
+            ]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, index_name):
+        # The seeded table is small, sequential scans are disabled so the
+        # plan shows whether the filter and ordering can use the index.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_users_list_uses_partial_index(self):
+        queryset = User.objects.filter(
+            is_active=True, deleted=False, is_superuser=False
+        ).order_by("-creation_date", "-id")[:50]
+        self.assertUsesIndex(queryset, "user_active_created_idx")
+
+    def test_users_by_role_list_uses_partial_index(self):
+        queryset = User.objects.filter(
+            is_active=True, deleted=False, is_superuser=False, role="P"
+        ).order_by("-creation_date", "-id")[:50]
+        self.assertUsesIndex(queryset, "user_active_role_idx")
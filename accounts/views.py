@@ -1,7 +1,5 @@
 from django.contrib.auth import get_user_model
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
 from rest_framework.generics import (
     ListCreateAPIView,
     RetrieveUpdateDestroyAPIView,
@@ -11,6 +9,8 @@ from rest_framework import permissions
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.views import TokenObtainPairView
+from api.cache import cache_page
+from api.pagination import UserKeysetCursorPagination
 from api.serializers import UserSerializer, MyTokenObtainPairSerializer
 from .permissions import IsAuthenticatedAndIsOwner, IsProjectManager
 
@@ -26,6 +26,7 @@ class ListCreateUser(ListCreateAPIView):
         is_superuser=False,
     )
     serializer_class = UserSerializer
+    pagination_class = UserKeysetCursorPagination
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -42,8 +43,7 @@ class ListCreateUser(ListCreateAPIView):
             ]
         return super().get_permissions()
 
-    @method_decorator(cache_page(60 * 30, key_prefix="user"))
-    @method_decorator(vary_on_cookie)
+    @method_decorator(cache_page(60 * 30, "users"))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -91,9 +91,9 @@ class ListProjectManagerUsers(ListAPIView):
         is_active=True, deleted=False, is_superuser=False, role="P"
     )
     permission_classes = [permissions.IsAdminUser | IsProjectManager]
+    pagination_class = UserKeysetCursorPagination
 
-    @method_decorator(cache_page(60 * 30, key_prefix="user"))
-    @method_decorator(vary_on_cookie)
+    @method_decorator(cache_page(60 * 30, "users"))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -104,9 +104,9 @@ class ListDeveloperUsers(ListAPIView):
         is_active=True, deleted=False, is_superuser=False, role="D"
     )
     permission_classes = [permissions.IsAdminUser | IsProjectManager]
+    pagination_class = UserKeysetCursorPagination
 
-    @method_decorator(cache_page(60 * 30, key_prefix="user"))
-    @method_decorator(vary_on_cookie)
+    @method_decorator(cache_page(60 * 30, "users"))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
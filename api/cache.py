@@ -0,0 +1,160 @@
+import time
+from copy import copy
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.cache import (
+    CacheMiddleware,
+    FetchFromCacheMiddleware,
+    UpdateCacheMiddleware,
+)
+from django.utils.decorators import decorator_from_middleware_with_args
+
+
+def generation_cache_key(tag):
+    return f"generation:{tag}"
+
+
+def stats_cache_key(name, result):
+    return f"cache-stats:{name}:{result}"
+
+
+def initial_generation():
+    # A lost generation key starts again from the clock instead of 1, so it
+    # doesn't go back to a generation that still has entries in the cache.
+    return time.time_ns()
+
+
+def get_generations(*tags):
+    """Return the current generation of every tag, in one round trip"""
+    keys = [generation_cache_key(tag) for tag in tags]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, initial_generation(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def get_key_prefix(*tags):
+    """Key prefix of the entries of the current generation of the tags"""
+    generations = get_generations(*tags)
+    return ".".join(
+        f"{tag}={generation}" for tag, generation in zip(tags, generations)
+    )
+
+
+def invalidate(*tags):
+    """Make every cached entry tagged with any of the tags unreachable
+
+    The generation of every tag is incremented, the entries of the previous
+    generation are not read again and expire with their timeout. It costs
+    one increment per tag, no matter how many keys are cached.
+    """
+    for tag in set(tags):
+        key = generation_cache_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, initial_generation(), timeout=None)
+
+
+def record_lookup(name, hit):
+    if not settings.CACHE_STATS_ENABLED:
+        return
+    key = stats_cache_key(name, "hits" if hit else "misses")
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats():
+    """Return the hits and misses of every cached view, by view name"""
+    stats = {}
+    for key, count in cache.get_many(
+        list(cache.iter_keys(stats_cache_key("*", "*")))
+    ).items():
+        _, name, result = key.split(":")
+        stats.setdefault(name, {"hits": 0, "misses": 0})[result] = count
+    return stats
+
+
+def reset_stats():
+    cache.delete_pattern(stats_cache_key("*", "*"))
+
+
+def get_identity(user, scope):
+    """Part of the cache keys telling who the response was rendered for
+
+    With the "role" scope users of the same role share the entries, with
+    the "user" scope every user has its own ones.
+    """
+    if not user.is_authenticated:
+        return "anonymous"
+    if scope == "user":
+        return f"user={user.pk}"
+    if user.is_staff:
+        return "role=admin"
+    return f"role={user.role}"
+
+
+class GenerationCacheMiddleware(CacheMiddleware):
+    """CacheMiddleware keyed by the user identity and the generation of tags
+
+    Tags are formatted with the URL kwargs of the view, e.g. "developer:
+    {developer_id}". The generations are read once per request, and the
+    response is stored with the same prefix it was looked up with. Hits and
+    misses are counted by view when CACHE_STATS_ENABLED is set.
+
+    The identity of the authenticated user is part of the keys instead of
+    the headers carrying the credentials, a JWT is different on every login
+    and would create an entry per token.
+    """
+
+    def __init__(self, get_response, tags=(), scope="role", **kwargs):
+        super().__init__(get_response, **kwargs)
+        self.tags = tags
+        self.scope = scope
+        self.name = get_response.__qualname__.split(".")[0]
+
+    def for_request(self, request):
+        """Copy of the middleware with the key prefix of the request"""
+        middleware = copy(self)
+        middleware.key_prefix = request._generation_key_prefix
+        return middleware
+
+    def process_request(self, request):
+        # The tags need the URL kwargs, the cache is read in process_view.
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        tags = [tag.format(**view_kwargs) for tag in self.tags]
+        identity = get_identity(request.user, self.scope)
+        request._generation_key_prefix = f"{identity}.{get_key_prefix(*tags)}"
+        response = FetchFromCacheMiddleware.process_request(
+            self.for_request(request), request
+        )
+        if request.method in ("GET", "HEAD"):
+            record_lookup(self.name, response is not None)
+        return response
+
+    def process_response(self, request, response):
+        if not hasattr(request, "_generation_key_prefix"):
+            return response
+        return UpdateCacheMiddleware.process_response(
+            self.for_request(request), request, response
+        )
+
+
+def cache_page(timeout, *tags, scope="role"):
+    """Same as django's cache_page, invalidated with invalidate(*tags)
+
+    Pages with several tags are invalidated by any of them. Pages rendered
+    differently for every user need scope="user", the rest are shared by
+    the users of the same role. Permissions are checked before the cache
+    is read, so only users allowed to see a page can get its entry.
+    """
+    return decorator_from_middleware_with_args(GenerationCacheMiddleware)(
+        page_timeout=timeout, tags=tags, scope=scope
+    )
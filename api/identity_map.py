@@ -0,0 +1,42 @@
+class IdentityMap:
+    """Objects already loaded in a request, by model and lookup field
+
+    Related fields look objects up here before querying the database, so
+    every related row is fetched at most once per request.
+    """
+
+    def __init__(self):
+        self._objects = {}
+
+    def get_key(self, model, field, value):
+        return model._meta.concrete_model, field, str(value)
+
+    def get(self, model, field, value):
+        return self._objects.get(self.get_key(model, field, value))
+
+    def add(self, instance, *fields):
+        """Store an instance by its primary key and the given fields"""
+        model = type(instance)
+        self._objects[self.get_key(model, "pk", instance.pk)] = instance
+        for field in fields:
+            key = self.get_key(model, field, getattr(instance, field))
+            self._objects[key] = instance
+
+
+def get_identity_map(context):
+    """Return the identity map of the request in the serializer context
+
+    The map is created on first use and starts with the authenticated
+    user. Serializers without a request keep the map in their context.
+    """
+    request = context.get("request")
+    if request is None:
+        return context.setdefault("identity_map", IdentityMap())
+    identity_map = getattr(request, "identity_map", None)
+    if identity_map is None:
+        identity_map = IdentityMap()
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            identity_map.add(user)
+        request.identity_map = identity_map
+    return identity_map
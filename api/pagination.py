@@ -0,0 +1,212 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """Opt-in keyset pagination over (created_at, id), newest first.
+
+    Lists are only paginated when the client sends a cursor or a page size,
+    otherwise the whole list is returned as before. The position is stored in
+    the cursor, so every page is an index range scan, no matter how deep.
+    Lists ordered by another field and the primary key are paginated by that
+    field instead.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering_field = "created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, descending = self.get_ordering(queryset)
+        self.cursor = self.decode_cursor(request, queryset)
+        field = self.field
+
+        if self.cursor is None:
+            reverse = False
+        else:
+            position, pk, reverse = self.cursor
+            # Rows after the cursor in the direction of the page, previous
+            # pages walk the list backwards.
+            lookup = "lt" if descending != reverse else "gt"
+            queryset = queryset.filter(
+                **{f"{field}__{lookup}e": position}
+            ).filter(
+                Q(**{f"{field}__{lookup}": position})
+                | Q(**{field: position, f"pk__{lookup}": pk})
+            )
+        if descending != reverse:
+            queryset = queryset.order_by(f"-{field}", "-pk")
+        else:
+            queryset = queryset.order_by(field, "pk")
+
+        # One extra row tells if there is another page in this direction.
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def is_requested(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            requested = None
+        if requested is not None and requested > 0:
+            page_size = requested
+        return min(page_size, settings.MAX_PAGE_SIZE)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        position = self.encode_position(getattr(instance, self.field))
+        payload = json.dumps([position, instance.pk, reverse])
+        cursor = urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def get_ordering(self, queryset):
+        """Return the field the list is paginated by and its direction
+
+        Lists explicitly ordered by a field and the primary key keep their
+        ordering, the rest are ordered by ordering_field, newest first.
+        """
+        order_by = queryset.query.order_by
+        if (
+            len(order_by) == 2
+            and isinstance(order_by[0], str)
+            and order_by[1].lstrip("-") in ("pk", "id")
+        ):
+            return order_by[0].lstrip("-"), order_by[0].startswith("-")
+        return self.ordering_field, True
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = urlsafe_b64decode(encoded.encode("ascii"))
+            position, pk, reverse = json.loads(payload)
+            position = self.decode_position(position, queryset)
+            pk = int(pk)
+        except (BinasciiError, TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if position is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position, pk, bool(reverse)
+
+    def encode_position(self, value):
+        return value.isoformat()
+
+    def decode_position(self, value, queryset):
+        try:
+            field = queryset.model._meta.get_field(self.field)
+            return field.to_python(value)
+        except (FieldDoesNotExist, DjangoValidationError):
+            return None
+
+
+class UserKeysetCursorPagination(KeysetCursorPagination):
+    ordering_field = "creation_date"
+
+
+class SearchRankCursorPagination(KeysetCursorPagination):
+    """Keyset pagination over (search_rank, id), best matches first.
+
+    Search results are always paginated, a common word may match most of
+    the rows.
+    """
+
+    ordering_field = "search_rank"
+
+    def is_requested(self, request):
+        return True
+
+    def encode_position(self, value):
+        return value
+
+    def decode_position(self, value, queryset):
+        return float(value)
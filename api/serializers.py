@@ -1,10 +1,25 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, Prefetch, prefetch_related_objects
+from django.db.models.functions import Cast
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.urls import reverse
 from django.utils import timezone
-from project_manager.models import Project, Task
+from project_manager.models import Project, ProjectDashboard, Task
+from project_manager.signals import tasks_bulk_created
+from project_manager.utils import bulk_create_with_unique_slug_codes
+from project_manager.validators import (
+    validate_project_is_active,
+    validate_user_is_active,
+    validate_user_is_developer,
+    validate_user_is_project_manager,
+)
 from accounts.utils import get_role_db_value
+from .identity_map import get_identity_map
 
 User = get_user_model()
 
@@ -87,6 +102,13 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
+class AvailableDeveloperSerializer(UserSerializer):
+    open_tasks = serializers.IntegerField(read_only=True)
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ("open_tasks",)
+
+
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     token_type = "Bearer"
 
@@ -109,26 +131,130 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         return new_data_representation
 
 
-class TaskSerializer(serializers.ModelSerializer):
-    developer = serializers.PrimaryKeyRelatedField(
+class SparseFieldsetMixin:
+    """Keep only the fields listed in the sparse_fields context value"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        sparse_fields = self.context.get("sparse_fields")
+        if sparse_fields:
+            for field_name in set(self.fields) - set(sparse_fields):
+                self.fields.pop(field_name)
+
+
+class IdentityMapRelatedFieldMixin:
+    """Resolve related objects once per request through the identity map
+
+    Objects found in the map are not fetched again, restrictions on them
+    are checked by the field validators against the resolved instance.
+    """
+
+    lookup_field = "pk"
+
+    def to_internal_value(self, data):
+        identity_map = get_identity_map(self.context)
+        model = self.get_queryset().model
+        instance = identity_map.get(model, self.lookup_field, data)
+        if instance is None:
+            instance = super().to_internal_value(data)
+            identity_map.add(instance, self.lookup_field)
+        return instance
+
+
+class IdentityMapPrimaryKeyRelatedField(
+    IdentityMapRelatedFieldMixin, serializers.PrimaryKeyRelatedField
+):
+    pass
+
+
+class IdentityMapSlugRelatedField(
+    IdentityMapRelatedFieldMixin, serializers.SlugRelatedField
+):
+    def __init__(self, slug_field=None, **kwargs):
+        super().__init__(slug_field=slug_field, **kwargs)
+        self.lookup_field = slug_field
+
+
+class TaskListSerializer(serializers.ListSerializer):
+    """Validate and create a list of tasks in a fixed number of queries"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, list) and (
+            self.max_length is None or len(data) <= self.max_length
+        ):
+            self.prefetch_related_objects(data)
+        return super().to_internal_value(data)
+
+    def prefetch_related_objects(self, data):
+        """Load the developers and projects of all the tasks in two queries
+
+        They are added to the identity map, where the related fields of
+        every task find them.
+        """
+        items = [item for item in data if isinstance(item, dict)]
+        developer_ids = {
+            str(item["developer"])
+            for item in items
+            if str(item.get("developer", "")).isdigit()
+        }
+        project_codes = {
+            str(item["project"]) for item in items if "project" in item
+        }
+        identity_map = get_identity_map(self.context)
+        developers = User.objects.filter(
+            pk__in=[
+                pk
+                for pk in developer_ids
+                if identity_map.get(User, "pk", pk) is None
+            ]
+        )
+        projects = Project.objects.filter(
+            code__in=[
+                code
+                for code in project_codes
+                if identity_map.get(Project, "code", code) is None
+            ]
+        )
+        for developer in developers:
+            identity_map.add(developer)
+        for project in projects:
+            identity_map.add(project, "code")
+
+    def create(self, validated_data):
+        request = self.context.get("request")
+        tasks = [
+            Task(**item, created_by=request.user, updated_by=request.user)
+            for item in validated_data
+        ]
+        with transaction.atomic():
+            tasks = bulk_create_with_unique_slug_codes(
+                model=Task,
+                instances=tasks,
+                names=[task.title for task in tasks],
+            )
+            Project.objects.update_task_counters(
+                [(None, task.counter) for task in tasks]
+            )
+        tasks_bulk_created.send(sender=Task, tasks=tasks)
+        return tasks
+
+
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    developer = IdentityMapPrimaryKeyRelatedField(
         many=False,
-        queryset=User.objects.filter(
-            is_active=True,
-            deleted=False,
-            role__exact="D",
-        ),
+        queryset=User.objects.all(),
+        validators=[validate_user_is_active, validate_user_is_developer],
     )
-    project = serializers.SlugRelatedField(
+    project = IdentityMapSlugRelatedField(
         slug_field="code",
         many=False,
-        queryset=Project.objects.filter(
-            is_active=True,
-            is_deleted=False,
-        ),
+        queryset=Project.objects.all(),
+        validators=[validate_project_is_active],
     )
 
     class Meta:
         model = Task
+        list_serializer_class = TaskListSerializer
         fields = (
             "code",
             "title",
@@ -151,9 +277,9 @@ class TaskSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         fields = self.context.get("fields", None)
-        representation.pop("project")
-        if fields:
-            representation["project"] = instance.project.code
+        project = representation.pop("project", None)
+        if fields and project is not None:
+            representation["project"] = project
         return representation
 
     def validate_final_date(self, value):
@@ -176,15 +302,140 @@ class TaskSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class TaskBulkFilterSerializer(serializers.Serializer):
+    project = serializers.SlugField(required=False)
+    developer = serializers.IntegerField(required=False)
+    is_completed = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError(
+                "Filter by at least one of: project, developer, is_completed"
+            )
+        return attrs
+
+
+class TaskListFilterSerializer(serializers.Serializer):
+    """Query params of the task list, see TaskFilterBackend"""
+
+    project = serializers.SlugField(required=False)
+    developer = serializers.IntegerField(required=False, min_value=1)
+    is_completed = serializers.BooleanField(required=False)
+    final_date_after = serializers.DateField(required=False)
+    final_date_before = serializers.DateField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    updated_after = serializers.DateTimeField(required=False)
+    updated_before = serializers.DateTimeField(required=False)
+    ordering = serializers.ChoiceField(
+        required=False,
+        choices=[
+            "created_at",
+            "-created_at",
+            "updated_at",
+            "-updated_at",
+            "final_date",
+            "-final_date",
+        ],
+    )
+
+
+class TaskBulkChangesSerializer(serializers.Serializer):
+    is_completed = serializers.BooleanField(required=False)
+    developer = IdentityMapPrimaryKeyRelatedField(
+        required=False,
+        queryset=User.objects.all(),
+        validators=[validate_user_is_active, validate_user_is_developer],
+    )
+    final_date = serializers.DateField(required=False)
+    # Days added to the final date of every task, negative to bring it
+    # forward, computed by the database in the same UPDATE.
+    final_date_shift_days = serializers.IntegerField(
+        required=False, min_value=-3650, max_value=3650
+    )
+
+    def validate_final_date(self, value):
+        if value < timezone.now().date():
+            raise serializers.ValidationError(
+                f"The final date must be a future date, "
+                f"{value} is before {timezone.now().date()}"
+            )
+        return value
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError(
+                "Change at least one of: is_completed, developer, "
+                "final_date, final_date_shift_days"
+            )
+        if "final_date" in attrs and "final_date_shift_days" in attrs:
+            raise serializers.ValidationError(
+                "Set either final_date or final_date_shift_days"
+            )
+        return attrs
+
+
+class TaskBulkUpdateSerializer(serializers.Serializer):
+    """Select tasks by codes or by a filter and apply the same changes"""
+
+    codes = serializers.ListField(
+        child=serializers.SlugField(),
+        required=False,
+        allow_empty=False,
+        max_length=settings.MAX_BULK_UPDATE_TASKS,
+    )
+    filter = TaskBulkFilterSerializer(required=False)
+    changes = TaskBulkChangesSerializer()
+
+    def validate(self, attrs):
+        if ("codes" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError(
+                "Select the tasks with either codes or filter"
+            )
+        return attrs
+
+    def get_lookup(self):
+        """Keyword arguments selecting the tasks in the WHERE clause"""
+        lookup = {}
+        if "codes" in self.validated_data:
+            lookup["code__in"] = self.validated_data["codes"]
+        else:
+            for field, value in self.validated_data["filter"].items():
+                if field == "project":
+                    lookup["project__code__exact"] = value
+                elif field == "developer":
+                    lookup["developer__id__exact"] = value
+                else:
+                    lookup[field] = value
+        shift = self.validated_data["changes"].get("final_date_shift_days")
+        if shift is not None and shift < 0:
+            # Tasks are never moved to a final date before today.
+            lookup["final_date__gte"] = timezone.now().date() - timedelta(
+                days=shift
+            )
+        return lookup
+
+    def get_changes(self):
+        """Keyword arguments of the UPDATE, shifts are F() expressions"""
+        changes = dict(self.validated_data["changes"])
+        shift = changes.pop("final_date_shift_days", None)
+        if shift is not None:
+            changes["final_date"] = Cast(
+                F("final_date") + timedelta(days=shift),
+                output_field=models.DateField(),
+            )
+        return changes
+
+
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     tasks = TaskSerializer(read_only=True, many=True)
-    project_manager = serializers.PrimaryKeyRelatedField(
+    project_manager = IdentityMapPrimaryKeyRelatedField(
         many=False,
-        queryset=User.objects.filter(
-            is_active=True,
-            deleted=False,
-            role__exact="P",
-        ),
+        queryset=User.objects.all(),
+        validators=[
+            validate_user_is_active,
+            validate_user_is_project_manager,
+        ],
     )
 
     class Meta:
@@ -206,13 +457,131 @@ class ProjectSerializer(serializers.ModelSerializer):
             "updated_at",
         )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.context.get("embed") == "none":
+            self.fields.pop("tasks", None)
+
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        limit = self.context.get("tasks_limit")
+        if limit is not None and "tasks" in representation:
+            # One task over the limit is loaded to know if there are more.
+            more_tasks = None
+            if len(representation["tasks"]) > limit:
+                request = self.context.get("request")
+                more_tasks = request.build_absolute_uri(
+                    f"{reverse('list_create_task')}?project={instance.code}"
+                )
+            representation["tasks"] = representation["tasks"][:limit]
+            # Sparse fieldsets return exactly the requested fields.
+            if not self.context.get("sparse_fields"):
+                representation["more_tasks"] = more_tasks
+        return representation
+
     def create(self, validated_data):
         request = self.context.get("request")
         validated_data["created_by"] = request.user
         validated_data["updated_by"] = request.user
-        return super().create(validated_data)
+        project = super().create(validated_data)
+        # A new project has no tasks, they are not queried to render it.
+        prefetch_related_objects(
+            [project], Prefetch("tasks", queryset=Task.objects.none())
+        )
+        return project
 
     def update(self, instance, validated_data):
         request = self.context.get("request")
         validated_data["updated_by"] = request.user
         return super().update(instance, validated_data)
+
+
+class ProjectSummarySerializer(ProjectSerializer):
+    tasks = None
+    open_tasks = serializers.IntegerField(read_only=True)
+    completed_tasks = serializers.IntegerField(read_only=True)
+    overdue_tasks = serializers.IntegerField(read_only=True)
+
+    class Meta(ProjectSerializer.Meta):
+        fields = (
+            "code",
+            "name",
+            "description",
+            "project_manager",
+            "is_active",
+            "open_tasks",
+            "completed_tasks",
+            "overdue_tasks",
+            "created_at",
+            "updated_at",
+        )
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    updated_since = serializers.DateTimeField(required=False)
+
+
+class TombstoneSerializer(serializers.Serializer):
+    """Project or task removed from the lists, disabled or deleted"""
+
+    code = serializers.SlugField()
+    is_active = serializers.BooleanField()
+    is_deleted = serializers.BooleanField()
+    updated_at = serializers.DateTimeField()
+
+
+class SyncProjectSerializer(ProjectSerializer):
+    tasks = None
+
+    class Meta(ProjectSerializer.Meta):
+        fields = tuple(
+            field
+            for field in ProjectSerializer.Meta.fields
+            if field != "tasks"
+        )
+
+
+class SyncSerializer(serializers.Serializer):
+    """Changes since a watermark, the tasks are not embedded in projects"""
+
+    watermark = serializers.DateTimeField()
+    projects = SyncProjectSerializer(many=True)
+    tasks = TaskSerializer(many=True)
+    removed_projects = TombstoneSerializer(many=True)
+    removed_tasks = TombstoneSerializer(many=True)
+
+
+class DeveloperStatsSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+    open_tasks = serializers.IntegerField()
+    completed_tasks = serializers.IntegerField()
+
+
+class ProjectStatsSerializer(serializers.Serializer):
+    code = serializers.SlugField()
+    tasks = serializers.IntegerField()
+    open_tasks = serializers.IntegerField()
+    completed_tasks = serializers.IntegerField()
+    completion_percentage = serializers.FloatField()
+    overdue_tasks = serializers.IntegerField()
+    next_deadline = serializers.DateField(allow_null=True)
+    developers = DeveloperStatsSerializer(many=True)
+
+
+class ProjectDashboardSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProjectDashboard
+        fields = (
+            "code",
+            "name",
+            "project_manager",
+            "tasks",
+            "open_tasks",
+            "completed_tasks",
+            "overdue_tasks",
+            "developers",
+            "created_at",
+            "refreshed_at",
+        )
@@ -153,8 +153,37 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": 50,
 }
 
+# Upper limit for the page_size query param of paginated lists
+MAX_PAGE_SIZE = 200
+
+# Max number of tasks embedded in every project, the rest are linked
+PROJECT_EMBEDDED_TASKS_LIMIT = 50
+
+# Max number of tasks accepted by a single bulk create request
+MAX_BULK_CREATE_TASKS = 100
+
+# Max number of task codes accepted by a single bulk update request
+MAX_BULK_UPDATE_TASKS = 1000
+
+# Seconds the sync watermark is moved back, changes of transactions still
+# running when a sync is read are returned by the next sync
+SYNC_WATERMARK_OVERLAP = 60
+
+# Seconds projects and tasks looked up by code stay in the object cache,
+# and seconds an unknown code is remembered as missing
+OBJECT_CACHE_TIMEOUT = 60 * 30
+OBJECT_CACHE_MISSING_TIMEOUT = 60
+
+# Count the hits and misses of the cached views, read them with the
+# cache_stats command. Every counted lookup costs a cache round trip
+CACHE_STATS_ENABLED = bool(
+    int(os.environ.get("CACHE_STATS_ENABLED") or DEBUG)
+)
+
 # JWT Token Configuration
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
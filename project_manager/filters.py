@@ -0,0 +1,144 @@
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from api.serializers import TaskListFilterSerializer
+from .models import Project, Task
+
+# Query params compared by equality and the column they filter.
+EQUALITY_FILTERS = {
+    "project": "project",
+    "developer": "developer",
+    "is_completed": "is_completed",
+}
+
+# Query params of ranges, with the column and lookup they filter.
+RANGE_FILTERS = {
+    "final_date_after": ("final_date", "gte"),
+    "final_date_before": ("final_date", "lte"),
+    "created_after": ("created_at", "gte"),
+    "created_before": ("created_at", "lte"),
+    "updated_after": ("updated_at", "gte"),
+    "updated_before": ("updated_at", "lte"),
+}
+
+# Ordering used when a range is given without ordering, deadlines go from
+# the closest one and timestamps from the newest one.
+RANGE_ORDERING = {
+    "final_date": "final_date",
+    "created_at": "-created_at",
+    "updated_at": "-updated_at",
+}
+
+
+def get_index_paths(model, condition):
+    """Return the (equality columns, ordering column) served by the indexes
+
+    An index on (a, b, c) with the given condition serves lists ordered by
+    a, lists filtered by a and ordered by b, and lists filtered by a and b
+    and ordered by c. The ordering column can also be filtered by a range.
+    """
+    paths = set()
+    for index in model._meta.indexes:
+        if index.condition != condition or index.contains_expressions:
+            continue
+        columns = [field.lstrip("-") for field in index.fields]
+        for position, column in enumerate(columns):
+            paths.add((frozenset(columns[:position]), column))
+    return paths
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """Filter and order the task list, only if an index can serve it
+
+    Supported params: project, developer, is_completed, final_date_after,
+    final_date_before, created_after, created_before, updated_after,
+    updated_before and ordering. Every combination must match one of the
+    partial indexes of the active tasks, so no request can scan the whole
+    table. Other combinations are rejected with the supported ones.
+    """
+
+    def get_index_paths(self):
+        if not hasattr(TaskFilterBackend, "_index_paths"):
+            TaskFilterBackend._index_paths = get_index_paths(
+                Task, Q(is_active=True, is_deleted=False)
+            )
+        return TaskFilterBackend._index_paths
+
+    def get_supported_combinations(self):
+        orderings = set(RANGE_ORDERING)
+        filters = {column: name for name, column in EQUALITY_FILTERS.items()}
+        combinations = []
+        for columns, ordering in self.get_index_paths():
+            if ordering not in orderings or not columns <= set(filters):
+                continue
+            names = " and ".join(sorted(filters[c] for c in columns))
+            combinations.append(
+                f"{names or 'no filters'} ordered by {ordering}"
+            )
+        return sorted(combinations)
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = TaskListFilterSerializer(data=request.query_params.dict())
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        searching = bool(getattr(view, "get_search_query", lambda: None)())
+        if searching and "ordering" in params:
+            raise ValidationError(
+                {"ordering": ["Search results are ordered by rank"]}
+            )
+
+        lookups = {}
+        equality_columns = set()
+        for name, column in EQUALITY_FILTERS.items():
+            if name in params:
+                equality_columns.add(column)
+                lookups[column] = params[name]
+        if "project" in lookups:
+            # The code is resolved to the id first, so the project column
+            # of the index is compared with a constant.
+            lookups["project"] = Project.objects.get_id_by_code(
+                lookups["project"]
+            )
+        range_columns = set()
+        for name, (column, lookup) in RANGE_FILTERS.items():
+            if name in params:
+                range_columns.add(column)
+                lookups[f"{column}__{lookup}"] = params[name]
+
+        ordering = params.get("ordering")
+        if ordering is None and len(range_columns) == 1:
+            ordering = RANGE_ORDERING[next(iter(range_columns))]
+        ordering = ordering or "-created_at"
+        ordering_column = ordering.lstrip("-")
+        if not searching:
+            self.check_index(equality_columns, range_columns, ordering_column)
+        if ordering_column == "final_date":
+            # Tasks without a deadline can't be placed in this ordering.
+            lookups["final_date__isnull"] = False
+
+        if "project" in lookups and lookups["project"] is None:
+            return queryset.none()
+        queryset = queryset.filter(**lookups)
+        if searching:
+            return queryset
+        pk_ordering = "-pk" if ordering.startswith("-") else "pk"
+        return queryset.order_by(ordering, pk_ordering)
+
+    def check_index(self, equality_columns, range_columns, ordering_column):
+        served = (
+            range_columns <= {ordering_column}
+            and (frozenset(equality_columns), ordering_column)
+            in self.get_index_paths()
+        )
+        if not served:
+            filters = sorted(equality_columns | range_columns)
+            raise ValidationError(
+                {
+                    "filters": [
+                        f"No index serves {', '.join(filters) or 'no filters'}"
+                        f" ordered by {ordering_column}, supported "
+                        f"combinations are: "
+                        f"{'; '.join(self.get_supported_combinations())}"
+                    ]
+                }
+            )
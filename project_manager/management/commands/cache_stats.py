@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Command to show the hit rate of every cached view"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Start counting again after showing the current values",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.CACHE_STATS_ENABLED:
+            self.stdout.write(
+                "The cached views are not counted, set CACHE_STATS_ENABLED"
+            )
+        stats = get_stats()
+        if not stats:
+            self.stdout.write("No cached views were requested yet")
+        for name, counts in sorted(stats.items()):
+            lookups = counts["hits"] + counts["misses"]
+            self.stdout.write(
+                f"{name}: {counts['hits']} hits, {counts['misses']} misses, "
+                f"{counts['hits'] / lookups:.1%} hit rate"
+            )
+        if options["reset"]:
+            reset_stats()
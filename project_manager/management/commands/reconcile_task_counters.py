@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from project_manager.models import Project
+
+
+class Command(BaseCommand):
+    help = "Command to recount the open and completed tasks of every project"
+
+    def handle(self, *args, **options):
+        # Counters are kept in sync on every task change, this fixes them
+        # after changes made outside the application, e.g. manual SQL.
+        fixed = Project.objects.reconcile_task_counters()
+        self.stdout.write(
+            f"Task counters reconciled, {fixed} projects were fixed"
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.9 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("project_manager", "0002_emaillog"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="emaillog",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="emaillog_created_at_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="project_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="task_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.9 on 2026-10-18 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("project_manager", "0003_created_at_id_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["-created_at", "-id"],
+                name="project_active_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["project_manager", "-created_at", "-id"],
+                name="project_active_pm_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["-created_at", "-id"],
+                name="task_active_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["developer", "-created_at", "-id"],
+                name="task_active_developer_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["project", "-created_at", "-id"],
+                name="task_active_project_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["developer", "project", "-created_at", "-id"],
+                name="task_active_dev_project_idx",
+            ),
+        ),
+        # Every list filters the active rows, the full indexes are
+        # replaced by the partial ones.
+        migrations.RemoveIndex(
+            model_name="project",
+            name="project_created_at_id_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_created_at_id_idx",
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.9 on 2026-10-18 08:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("project_manager", "0004_active_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_active", True),
+                    ("is_completed", False),
+                    ("is_deleted", False),
+                ),
+                fields=["developer"],
+                name="task_open_developer_idx",
+            ),
+        ),
+    ]
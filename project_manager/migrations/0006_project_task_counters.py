@@ -0,0 +1,51 @@
+# Generated by Django 4.2.9 on 2026-10-18 08:35
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_project_tasks(apps, schema_editor):
+    Project = apps.get_model("project_manager", "Project")
+    Task = apps.get_model("project_manager", "Task")
+    tasks = (
+        Task.objects.filter(
+            project=OuterRef("pk"), is_active=True, is_deleted=False
+        )
+        .order_by()
+        .values("project")
+    )
+
+    def count(is_completed):
+        return Coalesce(
+            Subquery(
+                tasks.filter(is_completed=is_completed)
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+
+    Project.objects.update(
+        open_tasks_count=count(False), completed_tasks_count=count(True)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("project_manager", "0005_open_tasks_developer_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="completed_tasks_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="open_tasks_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_project_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 4.2.9 on 2026-10-18 08:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Overdue tasks are counted with the date of the last refresh. The unique
+# index is required to refresh the view concurrently.
+CREATE_DASHBOARD_VIEW = """
+CREATE MATERIALIZED VIEW project_manager_projectdashboard AS
+SELECT
+    p.id AS project_id,
+    p.code,
+    p.name,
+    p.project_manager_id,
+    p.created_at,
+    COALESCE(SUM(d.tasks), 0)::integer AS tasks,
+    COALESCE(SUM(d.open_tasks), 0)::integer AS open_tasks,
+    COALESCE(SUM(d.tasks - d.open_tasks), 0)::integer AS completed_tasks,
+    COALESCE(SUM(d.overdue_tasks), 0)::integer AS overdue_tasks,
+    COALESCE(
+        jsonb_agg(
+            jsonb_build_object(
+                'id', u.id,
+                'first_name', u.first_name,
+                'last_name', u.last_name,
+                'tasks', d.tasks,
+                'open_tasks', d.open_tasks
+            )
+            ORDER BY d.open_tasks DESC, u.id
+        ) FILTER (WHERE u.id IS NOT NULL),
+        '[]'::jsonb
+    ) AS developers,
+    now() AS refreshed_at
+FROM project_manager_project p
+LEFT JOIN (
+    SELECT
+        project_id,
+        developer_id,
+        COUNT(*) AS tasks,
+        COUNT(*) FILTER (WHERE NOT is_completed) AS open_tasks,
+        COUNT(*) FILTER (
+            WHERE NOT is_completed AND final_date < CURRENT_DATE
+        ) AS overdue_tasks
+    FROM project_manager_task
+    WHERE is_active AND NOT is_deleted
+    GROUP BY project_id, developer_id
+) d ON d.project_id = p.id
+LEFT JOIN accounts_user u ON u.id = d.developer_id
+WHERE p.is_active AND NOT p.is_deleted
+GROUP BY p.id;
+
+CREATE UNIQUE INDEX project_dashboard_project_idx
+    ON project_manager_projectdashboard (project_id);
+CREATE INDEX project_dashboard_created_idx
+    ON project_manager_projectdashboard (created_at DESC, project_id DESC);
+"""
+
+DROP_DASHBOARD_VIEW = (
+    "DROP MATERIALIZED VIEW IF EXISTS project_manager_projectdashboard;"
+)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("project_manager", "0006_project_task_counters"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_DASHBOARD_VIEW, DROP_DASHBOARD_VIEW),
+        migrations.CreateModel(
+            name="ProjectDashboard",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="dashboard",
+                        serialize=False,
+                        to="project_manager.project",
+                    ),
+                ),
+                ("code", models.SlugField()),
+                ("name", models.CharField(max_length=200)),
+                ("created_at", models.DateTimeField()),
+                ("tasks", models.IntegerField()),
+                ("open_tasks", models.IntegerField()),
+                ("completed_tasks", models.IntegerField()),
+                ("overdue_tasks", models.IntegerField()),
+                ("developers", models.JSONField()),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Project Dashboard",
+                "verbose_name_plural": "Project Dashboards",
+                "db_table": "project_manager_projectdashboard",
+                "ordering": ["-created_at"],
+                "managed": False,
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 4.2.9 on 2026-10-18 09:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# Search vectors are computed by the database on insert and when the text
+# columns change, so bulk creates and updates keep them current too. The
+# title or name weighs more than the description.
+SEARCH_TRIGGER = """
+CREATE FUNCTION {table}_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(
+            to_tsvector('pg_catalog.english', coalesce(NEW.{title}, '')), 'A'
+        )
+        || setweight(
+            to_tsvector('pg_catalog.english', coalesce(NEW.description, '')),
+            'B'
+        );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER {table}_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF {title}, description ON {table}
+    FOR EACH ROW EXECUTE FUNCTION {table}_search_vector();
+
+UPDATE {table} SET {title} = {title};
+"""
+
+DROP_SEARCH_TRIGGER = """
+DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table};
+DROP FUNCTION IF EXISTS {table}_search_vector();
+"""
+
+
+def search_trigger(table, title):
+    return migrations.RunSQL(
+        SEARCH_TRIGGER.format(table=table, title=title),
+        DROP_SEARCH_TRIGGER.format(table=table),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("project_manager", "0007_project_dashboard_view"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["search_vector"],
+                name="project_active_search_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(("is_active", True), ("is_deleted", False)),
+                fields=["search_vector"],
+                name="task_active_search_idx",
+            ),
+        ),
+        search_trigger("project_manager_project", "name"),
+        search_trigger("project_manager_task", "title"),
+    ]
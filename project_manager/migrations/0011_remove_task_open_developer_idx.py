@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-18 12:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("project_manager", "0010_sync_updated_at_indexes"),
+    ]
+
+    operations = [
+        # task_active_dev_done_idx starts with (developer, is_completed) on
+        # the active tasks, it answers the open tasks by developer too.
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_open_developer_idx",
+        ),
+    ]
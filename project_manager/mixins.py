@@ -0,0 +1,556 @@
+import hashlib
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Count,
+    Max,
+    Prefetch,
+    prefetch_related_objects,
+)
+from django.http import Http404
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from api.pagination import SearchRankCursorPagination
+from api.serializers import ProjectSummarySerializer
+from .models import Project, Task, get_cached_object, is_missing_object
+from .signals import projects_bulk_updated, tasks_bulk_updated
+
+
+class SparseFieldsetViewMixin:
+    """Allow GET requests to ask only for some fields using ?fields=code,title
+
+    The fields are removed from the serializer and the queryset only loads
+    the columns it needs, so wide text columns are not fetched.
+    """
+
+    sparse_fields_query_param = "fields"
+
+    def get_sparse_fields(self):
+        if self.request.method != "GET":
+            return None
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self.parse_sparse_fields()
+        return self._sparse_fields
+
+    def parse_sparse_fields(self):
+        value = self.request.query_params.get(self.sparse_fields_query_param)
+        if not value:
+            return None
+        fields = [field.strip() for field in value.split(",") if field.strip()]
+        allowed_fields = self.get_serializer_class().Meta.fields
+        unknown_fields = [
+            field for field in fields if field not in allowed_fields
+        ]
+        if unknown_fields:
+            raise ValidationError(
+                {
+                    self.sparse_fields_query_param: [
+                        f"Unknown fields: {', '.join(unknown_fields)}, "
+                        f"allowed fields are: {', '.join(allowed_fields)}"
+                    ]
+                }
+            )
+        return fields
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields:
+            queryset = queryset.only_fields(sparse_fields)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        sparse_fields = self.get_sparse_fields()
+        if sparse_fields:
+            context["sparse_fields"] = sparse_fields
+        return context
+
+
+class ProjectEmbedMixin:
+    """Choose how tasks are included in projects with ?embed=none|summary|tasks
+
+    - none: projects without tasks.
+    - summary: open, completed and overdue tasks counts, computed in the
+      same query as the projects.
+    - tasks (default): embedded active tasks, capped to a fixed number with
+      a link to the rest of them.
+    """
+
+    embed_query_param = "embed"
+    embed_choices = ("none", "summary", "tasks")
+
+    def get_embed(self):
+        if self.request.method != "GET":
+            return None
+        embed = self.request.query_params.get(self.embed_query_param, "tasks")
+        if embed not in self.embed_choices:
+            raise ValidationError(
+                {
+                    self.embed_query_param: [
+                        f"{embed} is not a valid value, "
+                        f"use one of: {', '.join(self.embed_choices)}"
+                    ]
+                }
+            )
+        return embed
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        embed = self.get_embed()
+        if embed is None:
+            return queryset
+        queryset = queryset.prefetch_related(None)
+        if embed == "tasks":
+            queryset = queryset.with_active_tasks(
+                limit=settings.PROJECT_EMBEDDED_TASKS_LIMIT + 1
+            )
+        elif embed == "summary":
+            queryset = queryset.with_task_summary()
+        return queryset
+
+    def get_etag_version(self, probe):
+        version = super().get_etag_version(probe)
+        if self.get_embed() == "summary":
+            # Overdue tasks are counted against the current date.
+            version.append(timezone.localdate().isoformat())
+        return version
+
+    def get_serializer_class(self):
+        if self.get_embed() == "summary":
+            return ProjectSummarySerializer
+        return super().get_serializer_class()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        embed = self.get_embed()
+        if embed is not None:
+            context["embed"] = embed
+        if embed == "tasks":
+            context["tasks_limit"] = settings.PROJECT_EMBEDDED_TASKS_LIMIT
+        return context
+
+
+class SearchMixin:
+    """Full-text search of GET lists with ?q=, best matches first
+
+    The query uses the web search syntax ("quoted phrases", or, -excluded)
+    against the stored search vectors, and the results are always
+    paginated by rank.
+    """
+
+    search_query_param = "q"
+
+    def get_search_query(self):
+        if self.request.method != "GET":
+            return None
+        query = self.request.query_params.get(self.search_query_param, "")
+        return query.strip() or None
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        query = self.get_search_query()
+        if query:
+            queryset = queryset.search(query)
+        return queryset
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.get_search_query():
+            self._paginator = SearchRankCursorPagination()
+        return super().paginator
+
+
+class StateTransitionMixin:
+    """Enable, disable or delete the looked up object with one UPDATE
+
+    The state condition of the view queryset is part of the statement, so
+    concurrent requests can't apply the same transition twice. Projects
+    also change their tasks with ?cascade=true, in the same transaction.
+    Task changes move the task counters of their projects too, see
+    TaskQuerySet.update().
+    """
+
+    cascade_query_param = "cascade"
+
+    def get_cascade(self):
+        cascade = self.request.query_params.get(self.cascade_query_param, "")
+        return cascade.lower() in ("true", "1")
+
+    def perform_transition(self, changes, task_filter=None):
+        """Apply changes and return the number of updated rows by model
+
+        task_filter selects the tasks of a project changed on cascade.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        value = self.kwargs[lookup_url_kwarg]
+        queryset = self.get_queryset().filter(**{self.lookup_field: value})
+        user = self.request.user
+        counts = {}
+        with transaction.atomic():
+            updated = queryset.transition(user, **changes)
+            if not updated:
+                raise Http404(
+                    f"No {queryset.model._meta.verbose_name} matches the "
+                    f"given query."
+                )
+            if queryset.model is Project:
+                counts["projects"] = updated
+                if task_filter is not None and self.get_cascade():
+                    counts["tasks"] = Task.objects.filter(
+                        project__code__exact=value, **task_filter
+                    ).transition(user, **changes)
+            else:
+                counts["tasks"] = updated
+        # The codes of the tasks changed on cascade are not known.
+        if "projects" in counts:
+            projects_bulk_updated.send(
+                sender=Project, count=counts["projects"], codes=[value]
+            )
+            if counts.get("tasks"):
+                tasks_bulk_updated.send(sender=Task, count=counts["tasks"])
+        elif counts.get("tasks"):
+            tasks_bulk_updated.send(
+                sender=Task, count=counts["tasks"], codes=[value]
+            )
+        return counts
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The resource was changed since the given ETag."
+    default_code = "precondition_failed"
+
+
+class ConditionalRequestMixin:
+    """Strong ETags for GET and If-Match preconditions for PUT and PATCH
+
+    The ETag comes from the MAX(updated_at) and the count of the rows of the
+    response, and of the related rows shown inside them. Responses compute
+    it from the rows they already loaded, only requests with a conditional
+    header probe the database for it:
+
+    - Objects and unpaginated lists with a matching If-None-Match get a 304
+      response without loading or serializing the rows.
+    - Pages, searches and rows with annotations compare If-None-Match with
+      the ETag of the loaded response, a probe would aggregate the whole
+      list instead of the page.
+    - Updates with an If-Match that doesn't match the current ETag get a 412
+      response, so clients can't overwrite changes they haven't read.
+
+    Objects also get a Last-Modified header and honour If-Modified-Since.
+
+    etag_related lists the relations shown inside the rows, their changes
+    are part of the ETag when the view prefetches them.
+    """
+
+    etag_related = ()
+
+    def get_etag_source(self):
+        """The filtered queryset of the response, before pagination"""
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.is_object_request():
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_etag_queryset(self):
+        queryset = self.get_etag_source()
+        # The probe only needs the matching rows, not the annotations and
+        # prefetches of the response.
+        return queryset.model._default_manager.filter(
+            pk__in=queryset.values("pk")
+        )
+
+    def get_etag_relations(self, queryset):
+        """Return {relation: (related queryset, field)} of etag_related
+
+        Only the relations prefetched by the queryset are shown, with the
+        rows selected by their Prefetch queryset.
+        """
+        prefetched = {}
+        for lookup in queryset._prefetch_related_lookups:
+            if isinstance(lookup, Prefetch):
+                prefetched[lookup.prefetch_to] = lookup.queryset
+            else:
+                prefetched[lookup] = None
+        relations = {}
+        for relation in self.etag_related:
+            if relation not in prefetched:
+                continue
+            field = queryset.model._meta.get_field(relation)
+            related = prefetched[relation]
+            if related is None:
+                related = field.related_model._default_manager.all()
+            relations[relation] = (related, field.field.name)
+        return relations
+
+    def can_probe_etag(self):
+        """Whether a probe gives the ETag without loading the response"""
+        if self.get_etag_source().query.annotations:
+            return False
+        if self.is_object_request():
+            return True
+        paginator = self.paginator
+        return paginator is None or not paginator.is_requested(self.request)
+
+    def get_etag_probe(self):
+        queryset = self.get_etag_source()
+        rows = queryset.values("pk")
+        probe = queryset.model._default_manager.filter(
+            pk__in=rows
+        ).aggregate(updated_at=Max("updated_at"), count=Count("pk"))
+        for relation, (related, field) in self.get_etag_relations(
+            queryset
+        ).items():
+            shown = related.filter(**{f"{field}__in": rows}).values("pk")
+            related_probe = related.model._default_manager.filter(
+                pk__in=shown
+            ).aggregate(updated_at=Max("updated_at"), count=Count("pk"))
+            for key, value in related_probe.items():
+                probe[f"{relation}_{key}"] = value
+        return probe
+
+    def get_loaded_probe(self, queryset, rows):
+        """Return the probe values of the rows loaded for the response"""
+        probe = {
+            "updated_at": max(
+                (row.updated_at for row in rows), default=None
+            ),
+            "count": len(rows),
+        }
+        for relation in self.get_etag_relations(queryset):
+            # Read from the prefetched rows, without queries.
+            related = [
+                item for row in rows for item in getattr(row, relation).all()
+            ]
+            probe[f"{relation}_updated_at"] = max(
+                (item.updated_at for item in related), default=None
+            )
+            probe[f"{relation}_count"] = len(related)
+        # Annotations are computed with the rows, they are never probed.
+        for name in queryset.query.annotations:
+            probe[name] = [getattr(row, name) for row in rows]
+        return probe
+
+    def get_etag_version(self, probe):
+        return [str(value) for _, value in sorted(probe.items())]
+
+    def set_conditional_state(self, probe):
+        """Compute the (ETag, last modified) of the probe values
+
+        The ETag also depends on the path, the query params and the format,
+        as they change the representation. Objects that don't exist have no
+        ETag.
+        """
+        if probe["count"] == 0 and self.is_object_request():
+            self._conditional_state = (None, None)
+            return self._conditional_state
+        value = "|".join(
+            [
+                self.request.path,
+                self.request.META.get("QUERY_STRING", ""),
+                self.request.accepted_renderer.format,
+                *self.get_etag_version(probe),
+            ]
+        )
+        timestamps = [
+            value
+            for key, value in probe.items()
+            if key.endswith("updated_at") and value is not None
+        ]
+        self._conditional_state = (
+            f'"{hashlib.sha1(value.encode()).hexdigest()}"',
+            max(timestamps, default=None),
+        )
+        return self._conditional_state
+
+    def get_conditional_state(self):
+        """Return the current (ETag, last modified), probed once per request"""
+        if not hasattr(self, "_conditional_state"):
+            self.set_conditional_state(self.get_etag_probe())
+        return self._conditional_state
+
+    def is_object_request(self):
+        return (self.lookup_url_kwarg or self.lookup_field) in self.kwargs
+
+    def set_conditional_headers(self, response):
+        etag, last_modified = self.get_conditional_state()
+        if etag is not None:
+            response["ETag"] = etag
+        if last_modified is not None and self.is_object_request():
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    def set_loaded_conditional_headers(self, queryset, rows, response):
+        self.set_conditional_state(self.get_loaded_probe(queryset, rows))
+        return self.set_conditional_headers(response)
+
+    def has_conditional_get(self, request):
+        return (
+            "If-None-Match" in request.headers
+            or "If-Modified-Since" in request.headers
+        )
+
+    def is_not_modified(self, request, etag, last_modified):
+        """Compare the conditional headers with the ETag and the timestamp
+
+        last_modified is in seconds, as sent in Last-Modified.
+        """
+        if etag is None:
+            return False
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            # Weak comparison, as for any GET.
+            etags = [
+                tag.removeprefix("W/") for tag in parse_etags(if_none_match)
+            ]
+            return "*" in etags or etag in etags
+        # Only objects have Last-Modified, a row removed from a list
+        # doesn't move the MAX(updated_at) of the rest.
+        if_modified_since = parse_http_date_safe(
+            request.headers.get("If-Modified-Since", "")
+        )
+        return (
+            last_modified is not None
+            and if_modified_since is not None
+            and last_modified <= if_modified_since
+        )
+
+    def check_if_match(self, request):
+        if_match = request.headers.get("If-Match")
+        if if_match is None:
+            return
+        etag, _ = self.get_conditional_state()
+        if etag is None:
+            # The update raises the 404 response.
+            return
+        # Strong comparison, weak ETags never match.
+        etags = parse_etags(if_match)
+        if "*" not in etags and etag not in etags:
+            raise PreconditionFailed()
+
+    def get_not_modified_response(self, etag, last_modified):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        if not self.has_conditional_get(request):
+            return super().get(request, *args, **kwargs)
+        if self.can_probe_etag():
+            etag, last_modified = self.get_conditional_state()
+            if last_modified is not None and self.is_object_request():
+                last_modified = int(last_modified.timestamp())
+            else:
+                last_modified = None
+            if self.is_not_modified(request, etag, last_modified):
+                return self.get_not_modified_response(etag, last_modified)
+        # Pages are compared with the ETag they were rendered with, also
+        # when they are read from the cache.
+        response = super().get(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        etag = response.get("ETag")
+        last_modified = parse_http_date_safe(response.get("Last-Modified", ""))
+        if self.is_not_modified(request, etag, last_modified):
+            return self.get_not_modified_response(etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        serializer = self.get_serializer(rows, many=True)
+        if page is not None:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response(serializer.data)
+        return self.set_loaded_conditional_headers(queryset, rows, response)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return self.set_loaded_conditional_headers(
+            self.get_etag_source(), [instance], Response(serializer.data)
+        )
+
+    def update(self, request, *args, **kwargs):
+        if "If-Match" not in request.headers:
+            return super().update(request, *args, **kwargs)
+        with transaction.atomic():
+            # The row is locked until the update is committed, so no other
+            # request can change it between the check and the update.
+            list(
+                self.get_etag_queryset().select_for_update().values_list("pk")
+            )
+            self.check_if_match(request)
+            response = super().update(request, *args, **kwargs)
+        # The client can send the new ETag with its next update.
+        del self._conditional_state
+        return self.set_conditional_headers(response)
+
+
+class ObjectCacheMixin:
+    """Read the object of GET requests from the object cache, by code
+
+    See get_cached_object(), the prefetched rows of the view are loaded
+    again on every request. Updates read the stored row, as saving a cached
+    copy could write back values older than the row, but unknown codes are
+    rejected from the cache. Lookups with annotations, like the project
+    summary, are not cached.
+
+    It goes before ConditionalRequestMixin, the ETag of objects without
+    etag_related is computed from the cached row instead of a probe.
+    """
+
+    def get_lookup_code(self):
+        return self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+
+    def get_object_from_cache(self):
+        if not hasattr(self, "_cached_object"):
+            self._cached_object = get_cached_object(
+                self.get_queryset(), self.get_lookup_code()
+            )
+        return self._cached_object
+
+    def is_cacheable_read(self):
+        return self.request.method in ("GET", "HEAD")
+
+    def get_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.is_cacheable_read() and not queryset.query.annotations:
+            instance = self.get_object_from_cache()
+        elif is_missing_object(queryset.model, self.get_lookup_code()):
+            instance = None
+        else:
+            return super().get_object()
+        if instance is None:
+            raise Http404(
+                f"No {queryset.model._meta.verbose_name} matches the given "
+                f"query."
+            )
+        self.check_object_permissions(self.request, instance)
+        if self.is_cacheable_read():
+            prefetch_related_objects(
+                [instance], *queryset._prefetch_related_lookups
+            )
+        return instance
+
+    def get_etag_probe(self):
+        if not (self.is_object_request() and self.is_cacheable_read()):
+            return super().get_etag_probe()
+        instance = self.get_object_from_cache()
+        if instance is None:
+            return {"count": 0}
+        if self.etag_related:
+            return super().get_etag_probe()
+        # The values of a probe of the row.
+        return {"count": 1, "updated_at": instance.updated_at}
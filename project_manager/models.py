@@ -1,9 +1,30 @@
+from collections import Counter, defaultdict
+from copy import copy
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import (
+    Count,
+    F,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Window,
+)
+from django.db.models.functions import Cast, Coalesce, RowNumber
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVectorField,
+)
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils import timezone
-from .reference_model import Auditory
-from .utils import generate_unique_slug_code, email_purpose
+from api.cache import get_key_prefix, invalidate
+from .reference_model import Auditory, AuditoryQuerySet
+from .utils import save_with_unique_slug_code, email_purpose
 from .validators import (
     validate_user_is_project_manager,
     validate_user_is_developer,
@@ -14,6 +35,425 @@ User = get_user_model()
 # Create your models here.
 
 
+def project_id_cache_key(code):
+    return f"code-to-id:{code}"
+
+
+# Cache tag of the project stats, invalidated when the changed projects are
+# not known.
+PROJECT_STATS_TAG = "project-stats"
+
+
+def project_stats_cache_key(project_id):
+    # Overdue tasks depend on the date, stats of another day are not read.
+    prefix = get_key_prefix(PROJECT_STATS_TAG)
+    return f"{prefix}:{project_id}:{timezone.now().date()}"
+
+
+def object_cache_tag(model):
+    return f"{model._meta.model_name}-objects"
+
+
+def object_cache_keys(model, codes):
+    # Rows changed by bulk updates without known codes are evicted by
+    # incrementing the generation of every cached object of the model.
+    prefix = get_key_prefix(object_cache_tag(model))
+    return [f"{prefix}:{code}" for code in codes]
+
+
+# Stored instead of the row for codes without an active row.
+MISSING_OBJECT = "missing"
+
+
+def get_cacheable_copy(instance):
+    """Copy of the instance without prefetched and related rows
+
+    Prefetched rows change without the instance, they are loaded again on
+    every read. Only the relations selected by the cached lookup, listed in
+    object_cache_relations, are kept, without their own related rows, so
+    users are never stored with the objects.
+    """
+    relations = getattr(instance, "object_cache_relations", ())
+    instance = copy(instance)
+    instance.__dict__.pop("_prefetched_objects_cache", None)
+    instance._state.fields_cache = {
+        name: related if related is None else get_cacheable_copy(related)
+        for name, related in instance._state.fields_cache.items()
+        if name in relations
+    }
+    return instance
+
+
+def get_cached_object(queryset, code):
+    """Return the row of the queryset with the given code, or None
+
+    Rows are cached by code, and codes without a row are cached as missing,
+    so unknown codes reach the database once per
+    OBJECT_CACHE_MISSING_TIMEOUT. Reads only add absent keys, a concurrent
+    write-through is never replaced with an older row.
+    """
+    (key,) = object_cache_keys(queryset.model, [code])
+    instance = cache.get(key)
+    if isinstance(instance, str):
+        return None
+    if instance is None:
+        instance = (
+            queryset.prefetch_related(None).filter(code__exact=code).first()
+        )
+        if instance is None:
+            cache.add(
+                key,
+                MISSING_OBJECT,
+                timeout=settings.OBJECT_CACHE_MISSING_TIMEOUT,
+            )
+        else:
+            cache.add(
+                key,
+                get_cacheable_copy(instance),
+                timeout=settings.OBJECT_CACHE_TIMEOUT,
+            )
+    return instance
+
+
+def is_missing_object(model, code):
+    (key,) = object_cache_keys(model, [code])
+    return cache.get(key) == MISSING_OBJECT
+
+
+def cache_objects(model, instances):
+    """Write saved rows through to the object cache
+
+    Only active and not deleted rows are cached, the rest are evicted, as
+    rows loaded with only some columns. The search vector is never loaded
+    with the rows.
+    """
+    keys = object_cache_keys(model, [instance.code for instance in instances])
+    listed, evicted = {}, []
+    for key, instance in zip(keys, instances):
+        partial = instance.get_deferred_fields() - {"search_vector"}
+        if instance.is_listed and not partial:
+            listed[key] = get_cacheable_copy(instance)
+        else:
+            evicted.append(key)
+    if listed:
+        cache.set_many(listed, timeout=settings.OBJECT_CACHE_TIMEOUT)
+    if evicted:
+        cache.delete_many(evicted)
+
+
+def evict_objects(model, codes=None):
+    """Evict the rows with the given codes, or every row of the model"""
+    if codes is None:
+        invalidate(object_cache_tag(model))
+        return
+    cache.delete_many(object_cache_keys(model, codes))
+
+
+# Text search configuration of the search vectors, the triggers filling
+# them in the database use the same one.
+SEARCH_CONFIG = "english"
+
+
+class SearchableQuerySet(AuditoryQuerySet):
+    def search(self, text):
+        """Rows matching a web search style query, best matches first
+
+        The query is matched against the stored search_vector column, so
+        the GIN index is used instead of parsing every row.
+        """
+        query = SearchQuery(
+            text, config=SEARCH_CONFIG, search_type="websearch"
+        )
+        return (
+            self.filter(search_vector=query)
+            # Ranks are read as double precision, so they are compared
+            # exactly when they come back in a pagination cursor.
+            .annotate(
+                search_rank=Cast(
+                    SearchRank(F("search_vector"), query),
+                    output_field=models.FloatField(),
+                )
+            ).order_by("-search_rank", "-pk")
+        )
+
+
+class SearchableManager(models.Manager):
+    def get_queryset(self):
+        # The search vector is only read by the database, it is not loaded
+        # with the rows.
+        return super().get_queryset().defer("search_vector")
+
+
+def get_ordering_columns(queryset):
+    """Columns the queryset is ordered by, they are read for the cursors"""
+    return [
+        field.lstrip("-")
+        for field in queryset.query.order_by
+        if isinstance(field, str)
+        and field.lstrip("-") not in ("pk", "id", "?")
+        and "__" not in field
+        and field.lstrip("-") not in queryset.query.annotations
+    ]
+
+
+class ProjectQuerySet(SearchableQuerySet):
+    def with_active_tasks(self, limit=None):
+        # Nested tasks are loaded in one extra query for the whole page,
+        # the reverse relation also fills task.project, so the project code
+        # is available without more queries.
+        tasks = Task.objects.filter(is_active=True, is_deleted=False)
+        if limit is not None:
+            # Keep only the newest tasks of every project, numbered inside
+            # each project by a window function in the same query.
+            tasks = tasks.annotate(
+                project_row=Window(
+                    RowNumber(),
+                    partition_by=F("project"),
+                    order_by=[F("created_at").desc(), F("id").desc()],
+                )
+            ).filter(project_row__lte=limit)
+        return self.prefetch_related(Prefetch("tasks", queryset=tasks))
+
+    def with_task_summary(self):
+        """Annotate open, completed and overdue active tasks counts"""
+        # Open and completed tasks are read from the counters, overdue
+        # tasks depend on the current date so they are still counted.
+        active = Q(tasks__is_active=True, tasks__is_deleted=False)
+        return self.annotate(
+            open_tasks=F("open_tasks_count"),
+            completed_tasks=F("completed_tasks_count"),
+            overdue_tasks=Count(
+                "tasks",
+                filter=active
+                & Q(
+                    tasks__is_completed=False,
+                    tasks__final_date__lt=timezone.now().date(),
+                ),
+            ),
+        )
+
+    def update_task_counters(self, moves):
+        """Move tasks between the task counters of their projects
+
+        moves are (old, new) counters as returned by Task.get_counter().
+        Every project is changed once with F() expressions, so concurrent
+        changes add up instead of overwriting each other.
+        """
+        deltas = defaultdict(Counter)
+        for old, new in moves:
+            if old == new:
+                continue
+            if old is not None:
+                project_id, field = old
+                deltas[project_id][field] -= 1
+            if new is not None:
+                project_id, field = new
+                deltas[project_id][field] += 1
+        # Projects are always locked in the same order to avoid deadlocks.
+        for project_id in sorted(deltas):
+            changes = {
+                field: F(field) + delta
+                for field, delta in deltas[project_id].items()
+                if delta
+            }
+            if changes:
+                self.filter(pk=project_id).update(**changes)
+
+    def reconcile_task_counters(self):
+        """Recount the task counters from scratch
+
+        Return the number of projects whose counters were wrong. Task
+        writes wait until the counters are fixed, so none of them is
+        lost while counting.
+        """
+        tasks = (
+            Task.objects.filter(
+                project=OuterRef("pk"), is_active=True, is_deleted=False
+            )
+            .order_by()
+            .values("project")
+        )
+
+        def count(is_completed):
+            return Coalesce(
+                Subquery(
+                    tasks.filter(is_completed=is_completed)
+                    .annotate(count=Count("id"))
+                    .values("count")
+                ),
+                0,
+            )
+
+        counters = {
+            "open_tasks_count": count(False),
+            "completed_tasks_count": count(True),
+        }
+        with transaction.atomic(using=self.db):
+            with connections[self.db].cursor() as cursor:
+                cursor.execute(
+                    f"LOCK TABLE {Task._meta.db_table} IN SHARE MODE"
+                )
+            return self.exclude(**counters).update(**counters)
+
+    def get_stats(self, project_id):
+        """Return the task statistics of an active project, or None
+
+        Everything is computed in one statement: active tasks are grouped
+        by developer and the project totals are window functions over the
+        groups. A project without tasks returns a single empty group.
+        """
+        today = timezone.now().date()
+        sql = f"""
+            SELECT
+                u.id,
+                u.first_name,
+                u.last_name,
+                COUNT(t.id) FILTER (WHERE NOT t.is_completed),
+                COUNT(t.id) FILTER (WHERE t.is_completed),
+                SUM(COUNT(t.id)) OVER ()::integer,
+                SUM(COUNT(t.id) FILTER (WHERE t.is_completed))
+                    OVER ()::integer,
+                SUM(
+                    COUNT(t.id) FILTER (
+                        WHERE NOT t.is_completed AND t.final_date < %s
+                    )
+                ) OVER ()::integer,
+                MIN(
+                    MIN(t.final_date) FILTER (
+                        WHERE NOT t.is_completed AND t.final_date >= %s
+                    )
+                ) OVER ()
+            FROM {Project._meta.db_table} p
+            LEFT JOIN {Task._meta.db_table} t
+                ON t.project_id = p.id
+                AND t.is_active
+                AND NOT t.is_deleted
+            LEFT JOIN {User._meta.db_table} u ON u.id = t.developer_id
+            WHERE p.id = %s AND p.is_active AND NOT p.is_deleted
+            GROUP BY u.id
+            ORDER BY COUNT(t.id) DESC, u.id
+        """
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, [today, today, project_id])
+            rows = cursor.fetchall()
+        if not rows:
+            return None
+        _, _, _, _, _, tasks, completed, overdue, next_deadline = rows[0]
+        return {
+            "tasks": tasks,
+            "open_tasks": tasks - completed,
+            "completed_tasks": completed,
+            "completion_percentage": (
+                round(completed * 100 / tasks, 2) if tasks else 0.0
+            ),
+            "overdue_tasks": overdue,
+            "next_deadline": next_deadline,
+            "developers": [
+                {
+                    "id": developer_id,
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "open_tasks": open_tasks,
+                    "completed_tasks": completed_tasks,
+                }
+                for (
+                    developer_id,
+                    first_name,
+                    last_name,
+                    open_tasks,
+                    completed_tasks,
+                    *_,
+                ) in rows
+                if developer_id is not None
+            ],
+        }
+
+    def get_id_by_code(self, code):
+        """Return the id of the project with the given code, or None
+
+        Codes never change, so the code to id map is cached without
+        expiration.
+        """
+        key = project_id_cache_key(code)
+        project_id = cache.get(key)
+        if project_id is None:
+            project_id = (
+                self.filter(code__exact=code)
+                .values_list("id", flat=True)
+                .first()
+            )
+            if project_id is not None:
+                cache.set(key, project_id, timeout=None)
+        return project_id
+
+    def only_fields(self, fields):
+        """Load only the columns needed to render the given fields"""
+        queryset = self
+        if "tasks" not in fields:
+            queryset = queryset.prefetch_related(None)
+        columns = [
+            field
+            for field in fields
+            if field != "tasks" and field not in self.query.annotations
+        ]
+        # created_at is always loaded, it is the pagination key, and
+        # updated_at is part of the ETag.
+        return queryset.only(
+            "created_at", "updated_at", *get_ordering_columns(self), *columns
+        )
+
+
+class TaskQuerySet(SearchableQuerySet):
+    def with_project_code(self):
+        return self.select_related("project")
+
+    def only_fields(self, fields):
+        """Load only the columns needed to render the given fields"""
+        # The pagination keys and the timestamp of the ETag.
+        columns = [
+            "created_at",
+            "updated_at",
+            *get_ordering_columns(self),
+            *fields,
+        ]
+        if "project" in fields:
+            queryset = self.select_related("project")
+            columns.append("project__code")
+        else:
+            queryset = self.select_related(None)
+        return queryset.only(*columns)
+
+    def update(self, **kwargs):
+        """update() keeping the task counters of the projects in sync
+
+        When a counted field changes, the counted fields of the matching
+        rows are read and locked first, in the same transaction, and the
+        counters are moved with the changes applied to them.
+        """
+        changes = {
+            field: value
+            for field, value in kwargs.items()
+            if field in Task.counted_fields
+        }
+        if not changes:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            rows = list(
+                self.select_for_update(of=("self",))
+                .order_by("pk")
+                .values(*Task.counted_fields)
+            )
+            updated = super().update(**kwargs)
+            Project.objects.using(self.db).update_task_counters(
+                (
+                    Task.get_counter(**row),
+                    Task.get_counter(**{**row, **changes}),
+                )
+                for row in rows
+            )
+        return updated
+
+
 class Project(Auditory):
     # Code creation is handled by save() method.
     code = models.SlugField(unique=True, max_length=50, verbose_name="Code")
@@ -27,6 +467,12 @@ class Project(Auditory):
             validate_user_is_project_manager,
         ],
     )
+    # Active tasks of the project, maintained by the task signals and the
+    # state transitions, see ProjectQuerySet.update_task_counters().
+    open_tasks_count = models.IntegerField(default=0, editable=False)
+    completed_tasks_count = models.IntegerField(default=0, editable=False)
+    # Weighted name and description, filled by a database trigger.
+    search_vector = SearchVectorField(null=True, editable=False)
     created_by = models.ForeignKey(
         User, on_delete=models.DO_NOTHING, related_name="projects_created"
     )
@@ -34,16 +480,53 @@ class Project(Auditory):
         User, on_delete=models.DO_NOTHING, related_name="projects_updated"
     )
 
+    objects = SearchableManager.from_queryset(ProjectQuerySet)()
+
+    task_counter_fields = ("open_tasks_count", "completed_tasks_count")
+
     class Meta:
         verbose_name = "Project"
         verbose_name_plural = "Projects"
         ordering = [
             "-created_at",
         ]
+        indexes = [
+            # All the rows, tombstones included, for ?updated_since= syncs.
+            models.Index(
+                fields=["updated_at", "id"], name="project_updated_at_id_idx"
+            ),
+            # Partial indexes matching the filters and ordering of the views,
+            # they only cover active and non deleted rows.
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="project_active_created_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=["project_manager", "-created_at", "-id"],
+                name="project_active_pm_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            GinIndex(
+                fields=["search_vector"],
+                name="project_active_search_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return self.code
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Project manager of the stored row, post_save clears the cached
+        # lists of both project managers if it changes.
+        row = dict(zip(field_names, values))
+        if "project_manager_id" in row:
+            instance.loaded_project_manager_id = row["project_manager_id"]
+        return instance
+
     def save(
         self,
         force_insert=False,
@@ -51,15 +534,39 @@ class Project(Auditory):
         using=None,
         update_fields=None,
     ):
+        if update_fields is None and not self._state.adding:
+            # Counters are only changed with F() expressions, saving the
+            # loaded values would undo the changes made since then. Deferred
+            # columns, like the search vector, were not loaded either.
+            deferred_fields = self.get_deferred_fields()
+            update_fields = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.task_counter_fields
+                and field.attname not in deferred_fields
+            ]
+
+        def save():
+            super(Project, self).save(
+                force_insert=force_insert,
+                force_update=force_update,
+                using=using,
+                update_fields=update_fields,
+            )
+
         if not self.code:
-            self.code = generate_unique_slug_code(
-                name=self.name, model=Project
+            save_with_unique_slug_code(
+                instance=self, name=self.name, save=save, using=using
             )
-        super().save()
+        else:
+            save()
+        # The saved value is the stored one from now on.
+        self.loaded_project_manager_id = self.project_manager_id
 
 
 class Task(Auditory):
-    # Code creation is handled by a signal
+    # Code creation is handled by save() method.
     code = models.SlugField(unique=True, max_length=50, verbose_name="Code")
     title = models.CharField(max_length=200, verbose_name="Task title")
     description = models.TextField(verbose_name="Task Description")
@@ -80,6 +587,8 @@ class Task(Auditory):
     )
     is_completed = models.BooleanField(default=False)
     final_date = models.DateField(blank=True, null=True)
+    # Weighted title and description, filled by a database trigger.
+    search_vector = SearchVectorField(null=True, editable=False)
     created_by = models.ForeignKey(
         User, on_delete=models.DO_NOTHING, related_name="tasks_created"
     )
@@ -87,12 +596,179 @@ class Task(Auditory):
         User, on_delete=models.DO_NOTHING, related_name="tasks_updated"
     )
 
+    objects = SearchableManager.from_queryset(TaskQuerySet)()
+
+    # Columns deciding which project counter includes the task.
+    counted_fields = ("project_id", "is_active", "is_deleted", "is_completed")
+
+    # Related rows kept in the object cache, see with_project_code().
+    object_cache_relations = ("project",)
+
     class Meta:
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
         ordering = [
             "-created_at",
         ]
+        indexes = [
+            # All the rows, tombstones included, for ?updated_since= syncs.
+            models.Index(
+                fields=["updated_at", "id"], name="task_updated_at_id_idx"
+            ),
+            # Partial indexes matching the filters and ordering of the views,
+            # they only cover active and non deleted rows.
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="task_active_created_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=["developer", "-created_at", "-id"],
+                name="task_active_developer_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=["project", "-created_at", "-id"],
+                name="task_active_project_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=["developer", "project", "-created_at", "-id"],
+                name="task_active_dev_project_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            # Filters and orderings of the task list, see TaskFilterBackend.
+            models.Index(
+                fields=["is_completed", "-created_at", "-id"],
+                name="task_active_completed_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=["project", "is_completed", "-created_at", "-id"],
+                name="task_active_project_done_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            # Also answers the open tasks by developer, used to rank the
+            # available developers.
+            models.Index(
+                fields=["developer", "is_completed", "-created_at", "-id"],
+                name="task_active_dev_done_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=["-updated_at", "-id"],
+                name="task_active_updated_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=["final_date", "id"],
+                name="task_active_final_date_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=["project", "final_date", "id"],
+                name="task_active_project_final_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=["developer", "final_date", "id"],
+                name="task_active_dev_final_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            GinIndex(
+                fields=["search_vector"],
+                name="task_active_search_idx",
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+        ]
+
+    @staticmethod
+    def get_counter(project_id, is_active, is_deleted, is_completed):
+        """Return the (project id, counter field) including a task, or None"""
+        if not is_active or is_deleted:
+            return None
+        if is_completed:
+            return project_id, "completed_tasks_count"
+        return project_id, "open_tasks_count"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Counter and project of the stored row, post_save moves the task
+        # from them to the saved values.
+        row = dict(zip(field_names, values))
+        if "project_id" in row:
+            instance.loaded_project_id = row["project_id"]
+        if "developer_id" in row:
+            instance.loaded_developer_id = row["developer_id"]
+        if all(field in row for field in cls.counted_fields):
+            instance.loaded_counter = cls.get_counter(
+                **{field: row[field] for field in cls.counted_fields}
+            )
+        return instance
+
+    @property
+    def counter(self):
+        return self.get_counter(
+            **{field: getattr(self, field) for field in self.counted_fields}
+        )
+
+    def saves_counted_fields(self, update_fields):
+        if update_fields is None:
+            return True
+        # update_fields may name the project by its field or its column.
+        names = {"project", *self.counted_fields}
+        return not names.isdisjoint(update_fields)
+
+    def lock_stored_counter(self, using):
+        row = (
+            Task.objects.using(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values(*self.counted_fields)
+            .first()
+        )
+        if row is not None:
+            self.loaded_counter = self.get_counter(**row)
+            self.loaded_project_id = row["project_id"]
+
+    def save(
+        self,
+        force_insert=False,
+        force_update=False,
+        using=None,
+        update_fields=None,
+    ):
+        def save():
+            super(Task, self).save(
+                force_insert=force_insert,
+                force_update=force_update,
+                using=using,
+                update_fields=update_fields,
+            )
+
+        if not self.code:
+            save_with_unique_slug_code(
+                instance=self, name=self.title, save=save, using=using
+            )
+        elif (
+            self._state.adding
+            or force_insert
+            or not self.saves_counted_fields(update_fields)
+        ):
+            save()
+        else:
+            using = using or router.db_for_write(Task, instance=self)
+            with transaction.atomic(using=using, savepoint=False):
+                # The counted fields loaded with the task may be outdated by
+                # a concurrent save, post_save moves the task from the
+                # stored row, locked until the counters are moved.
+                self.lock_stored_counter(using)
+                save()
+        # The saved values are the stored row from now on.
+        self.loaded_counter = self.counter
+        self.loaded_project_id = self.project_id
+        self.loaded_developer_id = self.developer_id
 
     def clean(self):
         if self.final_date < timezone.now().date():
@@ -104,6 +780,54 @@ class Task(Auditory):
         return self.code
 
 
+class ProjectDashboard(models.Model):
+    """Task totals of every active project, read from a materialized view
+
+    The view is created by a migration and refreshed periodically by the
+    refresh_project_dashboard task, so its rows lag behind the tasks.
+    """
+
+    project = models.OneToOneField(
+        Project,
+        primary_key=True,
+        on_delete=models.DO_NOTHING,
+        related_name="dashboard",
+    )
+    code = models.SlugField(max_length=50)
+    name = models.CharField(max_length=200)
+    project_manager = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, related_name="+"
+    )
+    created_at = models.DateTimeField()
+    tasks = models.IntegerField()
+    open_tasks = models.IntegerField()
+    completed_tasks = models.IntegerField()
+    overdue_tasks = models.IntegerField()
+    # Active tasks of every developer of the project, busiest first.
+    developers = models.JSONField()
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "project_manager_projectdashboard"
+        verbose_name = "Project Dashboard"
+        verbose_name_plural = "Project Dashboards"
+        ordering = [
+            "-created_at",
+        ]
+
+    def __str__(self):
+        return self.code
+
+    @classmethod
+    def refresh(cls):
+        """Recompute the view without blocking the reads of the dashboard"""
+        with connections[router.db_for_write(cls)].cursor() as cursor:
+            cursor.execute(
+                f"REFRESH MATERIALIZED VIEW CONCURRENTLY {cls._meta.db_table}"
+            )
+
+
 class EmailLog(models.Model):
     # Redundancy added to reduce database query
     destination_email = models.EmailField(
@@ -127,6 +851,12 @@ class EmailLog(models.Model):
         ordering = [
             "-created_at",
         ]
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="emaillog_created_at_id_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"email log {self.pk}"
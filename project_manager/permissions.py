@@ -1,19 +1,17 @@
-from django.contrib.auth import get_user_model
-from rest_framework import permissions
+from accounts.permissions import MemoizedPermission
 
 
-User = get_user_model()
-
-
-class IsRequestedDeveloper(permissions.BasePermission):
-    def has_permission(self, request, view):
-        developer_id = view.kwargs["developer_id"]
-        developer = User.objects.filter(id=developer_id).first()
-        return developer == request.user
+class IsRequestedDeveloper(MemoizedPermission):
+    def check_permission(self, request, view):
+        # The requested id is compared with the authenticated user, the
+        # developer doesn't need to be fetched.
+        if not request.user.is_authenticated:
+            return False
+        return str(request.user.pk) == str(view.kwargs["developer_id"])
 
 
-class IsTaskDeveloper(permissions.BasePermission):
-    def has_object_permission(self, request, view, obj):
+class IsTaskDeveloper(MemoizedPermission):
+    def check_object_permission(self, request, view, obj):
         if not request.user.is_authenticated:
             return False
-        return obj.developer == request.user
+        return obj.developer_id == request.user.pk
@@ -1,4 +1,25 @@
 from django.db import models
+from django.db.models.functions import Now
+
+
+class AuditoryQuerySet(models.QuerySet):
+    def transition(self, user, **changes):
+        """Apply state changes in one UPDATE and return the affected rows.
+
+        The conditions of the queryset are part of the UPDATE, so rows
+        already in the target state are not counted.
+        """
+        return self.update(**changes, updated_by=user, updated_at=Now())
+
+    def changed_since(self, timestamp):
+        """Rows updated since timestamp, disabled and deleted ones included.
+
+        Every change sets updated_at, so the result has the rows a client
+        synced at timestamp has to add, update or remove.
+        """
+        return self.filter(updated_at__gte=timestamp).order_by(
+            "updated_at", "pk"
+        )
 
 
 class Auditory(models.Model):
@@ -7,5 +28,10 @@ class Auditory(models.Model):
     is_active = models.BooleanField(default=True)
     is_deleted = models.BooleanField(default=False)
 
+    @property
+    def is_listed(self):
+        """Active and not deleted, the rows shown by the lists"""
+        return self.is_active and not self.is_deleted
+
     class Meta:
         abstract = True
@@ -1,27 +1,115 @@
-from django.db.models.signals import pre_save, post_save
-from django.dispatch import receiver
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver, Signal
 from django.core.cache import cache
-from .models import Task, Project
-from .utils import generate_unique_slug_code
-from .tasks import send_email_to_developer_user_after_new_task_created
+from api.cache import invalidate
+from .models import (
+    PROJECT_STATS_TAG,
+    Task,
+    Project,
+    cache_objects,
+    evict_objects,
+    project_id_cache_key,
+    project_stats_cache_key,
+)
+from .tasks import (
+    send_email_to_developer_user_after_new_task_created,
+    send_email_to_developer_users_after_new_tasks_created,
+)
 
+# bulk_create() doesn't send post_save, this signal is sent once per batch
+# with the list of created tasks.
+tasks_bulk_created = Signal()
 
-def clear_cache(prefix):
-    cache_pattern = cache.keys("*" + prefix + "*")
-    delete_cache = cache.delete_many(cache_pattern)
+# update() doesn't send post_save either, this signal is sent once per
+# bulk update with the number of updated tasks, and their codes if they are
+# known.
+tasks_bulk_updated = Signal()
 
-
-@receiver(post_save, sender=Project)
-def clear_project_cache(sender, instance, **kwargs):
-    clear_cache("project")
+# Same as tasks_bulk_updated for projects changed with update().
+projects_bulk_updated = Signal()
 
 
-@receiver(pre_save, sender=Task)
-def set_slug_code(sender, instance, *args, **kwargs):
-    if not instance.code:
-        instance.code = generate_unique_slug_code(
-            name=instance.title, model=Task
+def get_project_manager_ids(tasks, project_ids):
+    """Project managers of the projects, without a query if already loaded"""
+    project_manager_ids = {
+        task.project_id: task.project.project_manager_id
+        for task in tasks
+        if Task.project.is_cached(task) and task.project is not None
+    }
+    missing = set(project_ids) - set(project_manager_ids)
+    if missing:
+        project_manager_ids.update(
+            Project.objects.filter(pk__in=missing).values_list(
+                "pk", "project_manager_id"
+            )
         )
+    return set(project_manager_ids.values())
+
+
+def get_task_cache_tags(tasks):
+    """Cache tags of the lists showing the tasks, before and after saving
+
+    Every task list and project list with embedded tasks, the lists of the
+    developers of the tasks and the lists of the project managers of their
+    projects.
+    """
+    developer_ids, project_ids = set(), set()
+    for task in tasks:
+        developer_ids |= {
+            task.developer_id,
+            getattr(task, "loaded_developer_id", None),
+        }
+        project_ids |= {
+            task.project_id,
+            getattr(task, "loaded_project_id", None),
+        }
+    developer_ids.discard(None)
+    project_ids.discard(None)
+    return [
+        "tasks",
+        "projects",
+        *(f"developer:{pk}" for pk in developer_ids),
+        *(
+            f"project-manager:{pk}"
+            for pk in get_project_manager_ids(tasks, project_ids)
+        ),
+    ]
+
+
+def get_project_cache_tags(project):
+    """Cache tags of the lists showing the project, before and after saving"""
+    project_manager_ids = {
+        project.project_manager_id,
+        getattr(project, "loaded_project_manager_id", None),
+    }
+    project_manager_ids.discard(None)
+    return [
+        "projects",
+        *(f"project-manager:{pk}" for pk in project_manager_ids),
+    ]
+
+
+def clear_project_stats_cache(project_ids=None):
+    """Clear the stats of the given projects, or of every project"""
+    if project_ids is None:
+        invalidate(PROJECT_STATS_TAG)
+        return
+    cache.delete_many(
+        [
+            project_stats_cache_key(pk)
+            for pk in set(project_ids)
+            if pk is not None
+        ]
+    )
+
+
+@receiver(post_save, sender=Project)
+def clear_project_cache(sender, instance, created, **kwargs):
+    invalidate(*get_project_cache_tags(instance))
+    clear_project_stats_cache([instance.pk])
+    if created:
+        # Only reachable if a code is reused, e.g. after restoring a backup.
+        cache.delete(project_id_cache_key(instance.code))
 
 
 @receiver(post_save, sender=Task)
@@ -33,8 +121,66 @@ def activate_async_task(sender, instance, created, *args, **kwargs):
         )
 
 
+@receiver(post_save, sender=Task)
+def update_project_task_counters(sender, instance, created, **kwargs):
+    if created:
+        loaded_counter = None
+    elif hasattr(instance, "loaded_counter"):
+        loaded_counter = instance.loaded_counter
+    else:
+        # Tasks built by hand or loaded without the counted fields, the
+        # stored counter is unknown, reconcile_task_counters fixes them.
+        return
+    Project.objects.update_task_counters([(loaded_counter, instance.counter)])
+
+
 @receiver(post_save, sender=Task)
 def clear_task_and_project_cache(sender, instance, **kwargs):
-    # In this case if a task is updated the project is updated
-    clear_cache("task")
-    clear_cache("project")
+    # Only the lists showing the task, a task moved to another developer or
+    # project changes the lists and the stats of both.
+    invalidate(*get_task_cache_tags([instance]))
+    clear_project_stats_cache(
+        [instance.project_id, getattr(instance, "loaded_project_id", None)]
+    )
+
+
+@receiver(tasks_bulk_created, sender=Task)
+def handle_tasks_bulk_created(sender, tasks, **kwargs):
+    # One notification job and one cache invalidation for the whole batch.
+    send_email_to_developer_users_after_new_tasks_created.delay(
+        [task.code for task in tasks]
+    )
+    invalidate(*get_task_cache_tags(tasks))
+    clear_project_stats_cache([task.project_id for task in tasks])
+    # Codes probed before the tasks existed are cached as missing.
+    cache_objects(Task, tasks)
+
+
+@receiver(projects_bulk_updated, sender=Project)
+def handle_projects_bulk_updated(sender, count, codes=None, **kwargs):
+    # The updated projects are not known, the lists of every project
+    # manager are cleared.
+    invalidate("projects", "project-manager")
+    clear_project_stats_cache()
+    evict_objects(Project, codes)
+
+
+@receiver(tasks_bulk_updated, sender=Task)
+def handle_tasks_bulk_updated(sender, count, codes=None, **kwargs):
+    # The updated tasks are not known, the lists of every developer and
+    # project manager are cleared, and none of the stats is kept.
+    invalidate("tasks", "projects", "developer", "project-manager")
+    clear_project_stats_cache()
+    evict_objects(Task, codes)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+def write_through_object_cache(sender, instance, **kwargs):
+    cache_objects(sender, [instance])
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Task)
+def evict_deleted_object(sender, instance, **kwargs):
+    evict_objects(sender, [instance.code])
@@ -1,13 +1,12 @@
 from django.core.mail import send_mail
 from django.db.models.functions import Now
 from core import settings
-from .models import EmailLog, Task
+from .models import EmailLog, ProjectDashboard, Task
 from celery import shared_task
 
 
-@shared_task
-def send_email_to_developer_user_after_new_task_created(task_code):
-    task = Task.objects.filter(code=task_code).first()
+def send_new_task_email(task):
+    """Send the new task email to the developer, return its unsaved log"""
     try:
         subject = f"New Task from project {task.project.name}"
         message = (
@@ -25,7 +24,7 @@ def send_email_to_developer_user_after_new_task_created(task_code):
         send_mail(
             subject, message, from_email, recipient_list, fail_silently=False
         )
-        email_log = EmailLog.objects.create(
+        return EmailLog(
             destination_email=task.developer.email,
             email_purpose="C",
             task=task,
@@ -33,7 +32,7 @@ def send_email_to_developer_user_after_new_task_created(task_code):
             error_info=None,
         )
     except Exception as e:
-        email_log = EmailLog.objects.create(
+        return EmailLog(
             destination_email=task.developer.email,
             email_purpose="C",
             task=task,
@@ -42,6 +41,23 @@ def send_email_to_developer_user_after_new_task_created(task_code):
         )
 
 
+@shared_task
+def send_email_to_developer_user_after_new_task_created(task_code):
+    task = Task.objects.filter(code=task_code).first()
+    email_log = send_new_task_email(task)
+    email_log.save()
+
+
+@shared_task
+def send_email_to_developer_users_after_new_tasks_created(task_codes):
+    # Tasks created in bulk are loaded with their developers, projects and
+    # project managers in one query, and their logs saved in another one.
+    tasks = Task.objects.filter(code__in=task_codes).select_related(
+        "developer", "project__project_manager"
+    )
+    EmailLog.objects.bulk_create([send_new_task_email(task) for task in tasks])
+
+
 @shared_task
 def send_email_to_project_manager_if_task_has_reached_its_deadline():
     tasks = Task.objects.filter(
@@ -85,3 +101,10 @@ def send_email_to_project_manager_if_task_has_reached_its_deadline():
                 delivered=False,
                 error_info=str(e),
             )
+
+
+@shared_task
+def refresh_project_dashboard():
+    # The dashboard is read from a materialized view, refreshing it here
+    # keeps the aggregation over every task out of the requests.
+    ProjectDashboard.refresh()
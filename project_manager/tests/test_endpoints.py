@@ -1,9 +1,38 @@
+from io import StringIO
+from threading import Event, Thread
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from rest_framework.test import APITestCase
-from rest_framework.test import APIClient
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework_simplejwt.tokens import RefreshToken
-from datetime import date
-from project_manager.models import Project, Task
+from datetime import date, timedelta
+from accounts.permissions import IsProjectManager, MemoizedPermission
+from api.cache import (
+    generation_cache_key,
+    get_identity,
+    get_stats,
+    reset_stats,
+)
+from api.serializers import TaskListFilterSerializer
+from project_manager.models import (
+    EmailLog,
+    Project,
+    Task,
+    object_cache_keys,
+)
+from project_manager.signals import tasks_bulk_created
+from project_manager.tasks import (
+    refresh_project_dashboard,
+    send_email_to_developer_users_after_new_tasks_created,
+)
 
 User = get_user_model()
 
@@ -113,6 +142,29 @@ class TestBaseClass(APITestCase):
             HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}"
         )
 
+    def create_projects_with_tasks(self, count, tasks_per_project=2):
+        """Create active projects, each one with active tasks"""
+        for i in range(count):
+            project = Project.objects.create(
+                code=f"extra-project-{i}",
+                name=f"Extra Project {i}",
+                description="Extra project description",
+                project_manager=self.test_pm_user,
+                created_by=self.test_pm_user,
+                updated_by=self.test_pm_user,
+            )
+            for j in range(tasks_per_project):
+                Task.objects.create(
+                    code=f"extra-task-{i}-{j}",
+                    title=f"Extra Task {i} {j}",
+                    description="Extra task description",
+                    developer=self.test_dev_user_3,
+                    project=project,
+                    final_date=date(9999, 10, 10),
+                    created_by=self.test_pm_user,
+                    updated_by=self.test_pm_user,
+                )
+
 
 class TestListCreateProject(TestBaseClass):
     """Test /api/v1/project-manager/projects/ endpoint"""
@@ -151,6 +203,28 @@ class TestListCreateProject(TestBaseClass):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 1)
 
+    def test_get_request_nested_tasks_dont_include_non_active_and_deleted_tasks(
+        self,
+    ):
+        self.test_task_2.is_active = False
+        self.test_task_2.save()
+        self.test_task_3.is_deleted = True
+        self.test_task_3.save()
+        response = self.client.get("/api/v1/project-manager/projects/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data[0]["tasks"]), 1)
+        self.assertEqual(
+            response.data[0]["tasks"][0]["code"], self.test_task.code
+        )
+
+    def test_get_request_query_count_does_not_grow_with_projects(self):
+        self.create_projects_with_tasks(10)
+        # User authentication, projects and their prefetched tasks.
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/v1/project-manager/projects/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 11)
+
     def test_post_request_unauthenticated_user_returns_401(self):
         self.client = APIClient()
         data = {
@@ -594,6 +668,14 @@ class TestListCreteTask(TestBaseClass):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 3)
 
+    def test_get_request_query_count_does_not_grow_with_tasks(self):
+        self.create_projects_with_tasks(5)
+        # User authentication and tasks joined with their project.
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/v1/project-manager/tasks/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 13)
+
     def test_post_request_unauthenticated_user_returns_401(self):
         self.client = APIClient()
         data = {
@@ -1173,6 +1255,14 @@ class TestListProjectsByProjectManager(TestBaseClass):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data), 2)
 
+    def test_get_request_query_count_does_not_grow_with_projects(self):
+        self.create_projects_with_tasks(10)
+        # User authentication, projects and their prefetched tasks.
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/v1/project-manager/projects/4")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 11)
+
     def test_wrong_user_id_returns_301(self):
         response = self.client.get("/api/v1/project-manager/projects/project")
         self.assertEqual(response.status_code, 301)
@@ -1822,3 +1912,1836 @@ class TestDisableTask(TestBaseClass):
             "/api/v1/project-manager/tasks/test-task-04-2024/disable"
         )
         self.assertEqual(response.status_code, 404)
+
+
+class TestKeysetPagination(TestBaseClass):
+    """Test opt-in cursor pagination on list endpoints"""
+
+    def test_get_request_without_pagination_params_returns_full_list(self):
+        response = self.client.get("/api/v1/project-manager/tasks/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
+
+    def test_get_request_with_page_size_returns_first_page(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?page_size=2"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(
+            response.data["results"][0]["code"], self.test_task_3.code
+        )
+        self.assertEqual(
+            response.data["results"][1]["code"], self.test_task_2.code
+        )
+        self.assertIsNotNone(response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+    def test_get_request_next_link_returns_next_page(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?page_size=2"
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(
+            response.data["results"][0]["code"], self.test_task.code
+        )
+        self.assertIsNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
+    def test_get_request_previous_link_returns_previous_page(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?page_size=2"
+        )
+        response = self.client.get(response.data["next"])
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [task["code"] for task in response.data["results"]],
+            [self.test_task_3.code, self.test_task_2.code],
+        )
+        self.assertIsNone(response.data["previous"])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_get_request_next_link_is_stable_after_new_rows_are_created(
+        self,
+    ):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?page_size=2"
+        )
+        self.create_projects_with_tasks(1)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [task["code"] for task in response.data["results"]],
+            [self.test_task.code],
+        )
+
+    @override_settings(MAX_PAGE_SIZE=2)
+    def test_get_request_page_size_is_capped(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?page_size=100"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_get_request_invalid_cursor_returns_404(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?cursor=not-a-cursor"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_request_project_list_is_paginated(self):
+        self.create_projects_with_tasks(2)
+        response = self.client.get(
+            "/api/v1/project-manager/projects/?page_size=2"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(
+            response.data["results"][0]["code"], self.test_project.code
+        )
+
+
+class TestSparseFieldsets(TestBaseClass):
+    """Test ?fields= query param trims the response and the queried columns"""
+
+    def test_get_request_task_list_returns_only_requested_fields(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?fields=code,title,final_date"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
+        for task in response.data:
+            self.assertEqual(set(task), {"code", "title", "final_date"})
+
+    def test_get_request_task_list_can_return_project_code(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?fields=code,project"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data[0],
+            {"code": self.test_task_3.code, "project": self.test_project.code},
+        )
+
+    def test_get_request_task_list_does_not_select_description(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                "/api/v1/project-manager/tasks/?fields=code,title,project"
+            )
+        self.assertEqual(response.status_code, 200)
+        task_query = context.captured_queries[-1]["sql"]
+        self.assertIn('"project_manager_task"."title"', task_query)
+        self.assertNotIn("description", task_query)
+
+    def test_get_request_task_detail_returns_only_requested_fields(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/test-task-01-2024/?fields=code"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"code": self.test_task.code})
+
+    def test_get_request_project_list_without_tasks_skips_prefetch(self):
+        # User authentication and projects, tasks are not loaded.
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/v1/project-manager/projects/?fields=code,name"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data[0],
+            {"code": self.test_project.code, "name": self.test_project.name},
+        )
+
+    def test_get_request_project_list_with_tasks_returns_nested_tasks(self):
+        response = self.client.get(
+            "/api/v1/project-manager/projects/?fields=code,tasks"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data[0]), {"code", "tasks"})
+        self.assertEqual(len(response.data[0]["tasks"]), 3)
+
+    def test_get_request_with_unknown_field_returns_400(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?fields=code,password"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_request_with_pagination_returns_only_requested_fields(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/?fields=code&page_size=2"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"],
+            [{"code": self.test_task_3.code}, {"code": self.test_task_2.code}],
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            response.data["results"], [{"code": "test-task-01-2024"}]
+        )
+
+    def test_get_request_with_ordering_loads_the_cursor_column(self):
+        url = "/api/v1/project-manager/tasks/?fields=code&ordering=final_date"
+        # User authentication and tasks, final_date is read for the cursor
+        # without loading the deferred column one task at a time.
+        with self.assertNumQueries(2):
+            response = self.client.get(f"{url}&page_size=2")
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(2):
+            response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class TestProjectEmbed(TestBaseClass):
+    """Test ?embed=none|summary|tasks query param in projects endpoints"""
+
+    def test_get_request_default_embeds_tasks(self):
+        response = self.client.get("/api/v1/project-manager/projects/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data[0]["tasks"]), 3)
+        self.assertIsNone(response.data[0]["more_tasks"])
+
+    def test_get_request_embed_none_returns_projects_without_tasks(self):
+        # User authentication and projects, tasks are not loaded.
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/v1/project-manager/projects/?embed=none"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("tasks", response.data[0])
+
+    def test_get_request_embed_summary_returns_task_counts(self):
+        self.test_task.is_completed = True
+        self.test_task.save()
+        self.test_task_2.final_date = date(2020, 1, 1)
+        self.test_task_2.save()
+        Task.objects.create(
+            code="test-task-04-2024",
+            title="Test Task number 4",
+            description="Task Description for task 4",
+            developer=self.test_dev_user_2,
+            project=self.test_project,
+            final_date=date(9999, 10, 10),
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+            is_deleted=True,
+        )
+        response = self.client.get(
+            "/api/v1/project-manager/projects/test-project-01-2024/?embed=summary"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("tasks", response.data)
+        self.assertEqual(response.data["open_tasks"], 2)
+        self.assertEqual(response.data["completed_tasks"], 1)
+        self.assertEqual(response.data["overdue_tasks"], 1)
+
+    def test_get_request_embed_summary_uses_a_single_query(self):
+        self.create_projects_with_tasks(10)
+        # User authentication and projects annotated with the counts.
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/v1/project-manager/projects/4?embed=summary"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 11)
+
+    @override_settings(PROJECT_EMBEDDED_TASKS_LIMIT=2)
+    def test_get_request_embedded_tasks_are_capped_with_more_link(self):
+        self.create_projects_with_tasks(1)
+        response = self.client.get("/api/v1/project-manager/projects/")
+        self.assertEqual(response.status_code, 200)
+        extra_project, test_project = response.data
+        self.assertEqual(len(extra_project["tasks"]), 2)
+        self.assertIsNone(extra_project["more_tasks"])
+        self.assertEqual(
+            [task["code"] for task in test_project["tasks"]],
+            [self.test_task_3.code, self.test_task_2.code],
+        )
+        self.assertEqual(
+            test_project["more_tasks"],
+            "http://testserver/api/v1/project-manager/tasks/"
+            "?project=test-project-01-2024",
+        )
+        response = self.client.get(test_project["more_tasks"])
+        self.assertEqual(len(response.data), 3)
+
+    def test_get_request_invalid_embed_returns_400(self):
+        response = self.client.get(
+            "/api/v1/project-manager/projects/?embed=everything"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TestBulkCreateTask(TestBaseClass):
+    """Test POST /tasks/ with a list of tasks"""
+
+    def get_tasks_data(self, count):
+        return [
+            {
+                "title": f"Bulk Task {i}",
+                "description": "Task created in bulk to test endpoints",
+                "project": "test-project-01-2024",
+                "developer": 1 + i % 3,
+                "is_completed": False,
+                "final_date": "9999-12-12",
+            }
+            for i in range(count)
+        ]
+
+    def test_post_request_with_a_list_creates_all_tasks(self):
+        response = self.client.post(
+            "/api/v1/project-manager/tasks/",
+            data=self.get_tasks_data(5),
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(Task.objects.count(), 8)
+        codes = [task["code"] for task in response.data]
+        self.assertEqual(len(set(codes)), 5)
+        task = Task.objects.get(code=codes[0])
+        self.assertEqual(task.created_by, self.test_pm_user)
+        self.assertEqual(task.updated_by, self.test_pm_user)
+        self.assertEqual(response.data[0]["project"], "test-project-01-2024")
+
+    def test_post_request_with_a_list_runs_a_fixed_number_of_queries(self):
+        # User authentication, developers, projects, the insert inside a
+        # savepoint so a code collision can be retried and the counters of
+        # the project, all of them inside the transaction.
+        with self.assertNumQueries(9):
+            response = self.client.post(
+                "/api/v1/project-manager/tasks/",
+                data=self.get_tasks_data(30),
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_post_request_with_a_list_sends_one_signal_per_batch(self):
+        batches = []
+
+        def receiver(sender, tasks, **kwargs):
+            batches.append(tasks)
+
+        tasks_bulk_created.connect(receiver, sender=Task)
+        self.addCleanup(tasks_bulk_created.disconnect, receiver, sender=Task)
+        self.client.post(
+            "/api/v1/project-manager/tasks/",
+            data=self.get_tasks_data(10),
+            format="json",
+        )
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 10)
+
+    def test_post_request_with_an_invalid_item_creates_nothing(self):
+        data = self.get_tasks_data(3)
+        data[1]["developer"] = 4
+        data[2]["project"] = "000000-project"
+        response = self.client.post(
+            "/api/v1/project-manager/tasks/", data=data, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("developer", response.data[1])
+        self.assertIn("project", response.data[2])
+        self.assertEqual(Task.objects.count(), 3)
+
+    def test_post_request_with_an_empty_list_returns_400(self):
+        response = self.client.post(
+            "/api/v1/project-manager/tasks/", data=[], format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(MAX_BULK_CREATE_TASKS=2)
+    def test_post_request_with_too_many_tasks_returns_400(self):
+        response = self.client.post(
+            "/api/v1/project-manager/tasks/",
+            data=self.get_tasks_data(3),
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Task.objects.count(), 3)
+
+    def test_post_request_authenticated_dev_user_returns_403(self):
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.test_dev_user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}"
+        )
+        response = self.client.post(
+            "/api/v1/project-manager/tasks/",
+            data=self.get_tasks_data(2),
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_bulk_email_task_sends_one_email_per_task(self):
+        send_email_to_developer_users_after_new_tasks_created(
+            [self.test_task.code, self.test_task_3.code]
+        )
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(
+            EmailLog.objects.filter(email_purpose="C", delivered=True).count(),
+            2,
+        )
+
+
+class TestBulkUpdateTasks(TestBaseClass):
+    """Test PATCH /tasks/bulk-update endpoint"""
+
+    url = "/api/v1/project-manager/tasks/bulk-update"
+
+    def test_patch_request_unauthenticated_user_returns_401(self):
+        self.client = APIClient()
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task.code],
+                "changes": {"is_completed": True},
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_patch_request_with_codes_updates_the_tasks(self):
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task.code, self.test_task_3.code],
+                "changes": {"is_completed": True, "developer": 3},
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"updated": 2})
+        for task in (self.test_task, self.test_task_3):
+            task.refresh_from_db()
+            self.assertTrue(task.is_completed)
+            self.assertEqual(task.developer, self.test_dev_user_3)
+        self.test_task_2.refresh_from_db()
+        self.assertFalse(self.test_task_2.is_completed)
+
+    def test_patch_request_shifts_the_final_dates(self):
+        soon = timezone.now().date() + timedelta(days=3)
+        Task.objects.filter(pk=self.test_task_2.pk).update(final_date=soon)
+        response = self.client.patch(
+            self.url,
+            data={
+                "filter": {"project": self.test_project.code},
+                "changes": {"final_date_shift_days": -10},
+            },
+            format="json",
+        )
+        # The task due in 3 days would move before today, it is skipped.
+        self.assertEqual(response.data, {"updated": 2})
+        for task in (self.test_task, self.test_task_3):
+            task.refresh_from_db()
+            self.assertEqual(task.final_date, date(9999, 9, 30))
+        self.test_task_2.refresh_from_db()
+        self.assertEqual(self.test_task_2.final_date, soon)
+
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task_2.code],
+                "changes": {"final_date_shift_days": 5},
+            },
+            format="json",
+        )
+        self.assertEqual(response.data, {"updated": 1})
+        self.test_task_2.refresh_from_db()
+        self.assertEqual(
+            self.test_task_2.final_date, soon + timedelta(days=5)
+        )
+
+    def test_patch_request_with_codes_doesnt_shift_final_dates_to_the_past(
+        self,
+    ):
+        soon = timezone.now().date() + timedelta(days=3)
+        Task.objects.filter(pk=self.test_task_2.pk).update(final_date=soon)
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task.code, self.test_task_2.code],
+                "changes": {"final_date_shift_days": -10},
+            },
+            format="json",
+        )
+        self.assertEqual(response.data, {"updated": 1})
+        self.test_task.refresh_from_db()
+        self.assertEqual(self.test_task.final_date, date(9999, 9, 30))
+        self.test_task_2.refresh_from_db()
+        self.assertEqual(self.test_task_2.final_date, soon)
+
+    def test_patch_request_with_final_date_and_shift_returns_400(self):
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task.code],
+                "changes": {
+                    "final_date": "9999-01-01",
+                    "final_date_shift_days": 5,
+                },
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_patch_request_with_filter_updates_the_matching_tasks(self):
+        response = self.client.patch(
+            self.url,
+            data={
+                "filter": {"project": self.test_project.code, "developer": 1},
+                "changes": {"final_date": "9999-01-01"},
+            },
+            format="json",
+        )
+        self.assertEqual(response.data, {"updated": 2})
+        self.assertEqual(
+            Task.objects.filter(final_date=date(9999, 1, 1)).count(), 2
+        )
+
+    def test_patch_request_sets_updated_by_and_updated_at(self):
+        updated_at = self.test_task.updated_at
+        self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task.code],
+                "changes": {"is_completed": True},
+            },
+            format="json",
+        )
+        self.test_task.refresh_from_db()
+        self.assertEqual(self.test_task.updated_by, self.test_pm_user)
+        self.assertGreater(self.test_task.updated_at, updated_at)
+
+    def test_patch_request_runs_a_single_update(self):
+        # User authentication, the tasks locked to move their counters, the
+        # update and the counters of the project.
+        with self.assertNumQueries(4):
+            response = self.client.patch(
+                self.url,
+                data={
+                    "filter": {"is_completed": False},
+                    "changes": {"is_completed": True},
+                },
+                format="json",
+            )
+        self.assertEqual(response.data, {"updated": 3})
+
+    def test_patch_request_skips_inactive_tasks(self):
+        self.test_task.is_active = False
+        self.test_task.save()
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task.code, self.test_task_2.code],
+                "changes": {"is_completed": True},
+            },
+            format="json",
+        )
+        self.assertEqual(response.data, {"updated": 1})
+
+    def test_patch_request_dev_user_only_updates_own_tasks(self):
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.test_dev_user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}"
+        )
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [
+                    self.test_task.code,
+                    self.test_task_2.code,
+                    self.test_task_3.code,
+                ],
+                "changes": {"is_completed": True},
+            },
+            format="json",
+        )
+        self.assertEqual(response.data, {"updated": 2})
+        self.test_task_3.refresh_from_db()
+        self.assertFalse(self.test_task_3.is_completed)
+
+    def test_patch_request_with_codes_and_filter_returns_400(self):
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task.code],
+                "filter": {"developer": 1},
+                "changes": {"is_completed": True},
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_patch_request_without_changes_returns_400(self):
+        response = self.client.patch(
+            self.url,
+            data={"codes": [self.test_task.code], "changes": {}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_patch_request_with_past_final_date_returns_400(self):
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task.code],
+                "changes": {"final_date": "2021-12-12"},
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_patch_request_with_project_manager_as_developer_returns_400(
+        self,
+    ):
+        response = self.client.patch(
+            self.url,
+            data={
+                "codes": [self.test_task.code],
+                "changes": {"developer": 4},
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TestStateTransitions(TestBaseClass):
+    """Test enable, disable and delete run as conditional updates"""
+
+    project_url = "/api/v1/project-manager/projects/test-project-01-2024"
+    task_url = "/api/v1/project-manager/tasks/test-task-01-2024"
+
+    def test_disable_task_runs_a_single_update(self):
+        # User authentication, the task locked, the update and the counters
+        # of its project inside the transaction.
+        with self.assertNumQueries(6):
+            response = self.client.delete(f"{self.task_url}/disable")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.data["tasks"], 1)
+        self.test_task.refresh_from_db()
+        self.assertFalse(self.test_task.is_active)
+        self.assertEqual(self.test_task.updated_by, self.test_pm_user)
+        self.test_project.refresh_from_db()
+        self.assertEqual(self.test_project.open_tasks_count, 2)
+
+    def test_enable_task_returns_affected_rows(self):
+        self.client.delete(f"{self.task_url}/disable")
+        response = self.client.put(f"{self.task_url}/enable")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["tasks"], 1)
+
+    def test_disable_project_without_cascade_keeps_tasks_active(self):
+        response = self.client.delete(f"{self.project_url}/disable")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.data["projects"], 1)
+        self.assertNotIn("tasks", response.data)
+        self.assertEqual(
+            Task.objects.filter(
+                project=self.test_project, is_active=True
+            ).count(),
+            3,
+        )
+
+    def test_disable_project_with_cascade_disables_its_tasks(self):
+        # User authentication, project update, tasks locked, tasks update and
+        # counters of the project inside the transaction.
+        with self.assertNumQueries(7):
+            response = self.client.delete(
+                f"{self.project_url}/disable?cascade=true"
+            )
+        self.assertEqual(response.data["projects"], 1)
+        self.assertEqual(response.data["tasks"], 3)
+        self.assertFalse(
+            Task.objects.filter(
+                project=self.test_project, is_active=True
+            ).exists()
+        )
+        self.test_project.refresh_from_db()
+        self.assertEqual(self.test_project.open_tasks_count, 0)
+
+    def test_enable_project_with_cascade_enables_non_deleted_tasks(self):
+        self.client.delete(f"{self.task_url}/")
+        self.client.delete(f"{self.project_url}/disable?cascade=true")
+        response = self.client.put(f"{self.project_url}/enable?cascade=true")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["projects"], 1)
+        self.assertEqual(response.data["tasks"], 2)
+        self.test_task.refresh_from_db()
+        self.assertFalse(self.test_task.is_active)
+        self.assertTrue(self.test_task.is_deleted)
+
+    def test_delete_project_with_cascade_deletes_its_tasks(self):
+        response = self.client.delete(f"{self.project_url}/?cascade=true")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.data["tasks"], 3)
+        self.assertEqual(
+            Task.objects.filter(
+                project=self.test_project, is_deleted=True, is_active=False
+            ).count(),
+            3,
+        )
+
+    def test_disable_project_twice_returns_404(self):
+        self.client.delete(f"{self.project_url}/disable")
+        response = self.client.delete(f"{self.project_url}/disable")
+        self.assertEqual(response.status_code, 404)
+
+    def test_disable_project_clears_the_projects_cache(self):
+        response = self.client.get("/api/v1/project-manager/projects/")
+        self.assertEqual(len(response.data), 1)
+        self.client.delete(f"{self.project_url}/disable")
+        response = self.client.get("/api/v1/project-manager/projects/")
+        self.assertEqual(len(response.data), 0)
+
+
+class TestIdentityMap(TestBaseClass):
+    """Test write requests fetch every related row once"""
+
+    def test_post_project_led_by_the_request_user_doesnt_fetch_it_again(
+        self,
+    ):
+        data = {
+            "name": "New Project",
+            "description": "Project created to test endpoints",
+            "project_manager": self.test_pm_user.id,
+        }
+        # User authentication and the insert inside a savepoint.
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                "/api/v1/project-manager/projects/", data=data
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_post_task_fetches_developer_and_project_once(self):
+        data = {
+            "title": "New Task Created",
+            "description": "Task created to test endpoints",
+            "project": "test-project-01-2024",
+            "developer": 1,
+            "is_completed": False,
+            "final_date": "9999-12-12",
+        }
+        # User authentication, developer, project, the insert and the open
+        # tasks counter inside a savepoint.
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                "/api/v1/project-manager/tasks/", data=data
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_post_task_assigned_to_the_request_user_is_rejected(self):
+        data = {
+            "title": "New Task Created",
+            "description": "Task created to test endpoints",
+            "project": "test-project-01-2024",
+            "developer": self.test_pm_user.id,
+            "is_completed": False,
+            "final_date": "9999-12-12",
+        }
+        response = self.client.post(
+            "/api/v1/project-manager/tasks/", data=data
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("is not a developer", str(response.data["developer"]))
+
+    def test_post_task_with_deleted_developer_is_rejected(self):
+        self.test_dev_user.deleted = True
+        self.test_dev_user.save()
+        data = {
+            "title": "New Task Created",
+            "description": "Task created to test endpoints",
+            "project": "test-project-01-2024",
+            "developer": self.test_dev_user.id,
+            "is_completed": False,
+            "final_date": "9999-12-12",
+        }
+        response = self.client.post(
+            "/api/v1/project-manager/tasks/", data=data
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_task_to_inactive_project_is_rejected(self):
+        self.test_project.is_active = False
+        self.test_project.save()
+        data = {
+            "title": "New Task Created",
+            "description": "Task created to test endpoints",
+            "project": "test-project-01-2024",
+            "developer": 1,
+            "is_completed": False,
+            "final_date": "9999-12-12",
+        }
+        response = self.client.post(
+            "/api/v1/project-manager/tasks/", data=data
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("project", response.data)
+
+    def test_bulk_update_developer_is_fetched_once(self):
+        # User authentication, developer and the update.
+        with self.assertNumQueries(3):
+            response = self.client.patch(
+                "/api/v1/project-manager/tasks/bulk-update",
+                data={
+                    "codes": [self.test_task.code],
+                    "changes": {"developer": 3},
+                },
+                format="json",
+            )
+        self.assertEqual(response.data, {"updated": 1})
+
+
+class TestPermissions(TestBaseClass):
+    """Test permissions compare ids on request.user without queries"""
+
+    def authenticate(self, user):
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}"
+        )
+
+    def test_requested_developer_doesnt_fetch_the_developer(self):
+        self.authenticate(self.test_dev_user)
+        # User authentication and tasks.
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                f"/api/v1/project-manager/tasks/{self.test_dev_user.id}"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_other_developer_is_forbidden_without_queries(self):
+        self.authenticate(self.test_dev_user_2)
+        # User authentication only.
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f"/api/v1/project-manager/tasks/{self.test_dev_user.id}"
+            )
+        self.assertEqual(response.status_code, 403)
+
+    def test_task_developer_can_update_own_task(self):
+        self.authenticate(self.test_dev_user)
+        response = self.client.patch(
+            f"/api/v1/project-manager/tasks/{self.test_task.code}/",
+            data={"is_completed": True},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_task_developer_cant_update_other_developer_task(self):
+        self.authenticate(self.test_dev_user)
+        response = self.client.patch(
+            f"/api/v1/project-manager/tasks/{self.test_task_3.code}/",
+            data={"is_completed": True},
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_composed_permissions_run_each_check_once_per_request(self):
+        calls = []
+
+        class CountedPermission(MemoizedPermission):
+            def check_permission(self, request, view):
+                calls.append("permission")
+                return True
+
+            def check_object_permission(self, request, view, obj):
+                calls.append("object")
+                return True
+
+        request = APIRequestFactory().get("/")
+        request.user = self.test_pm_user
+        permission = (IsProjectManager | CountedPermission)()
+        for _ in range(3):
+            permission.has_permission(request, None)
+            permission.has_object_permission(request, None, self.test_task)
+        # IsProjectManager grants access, the counted one is never reached.
+        self.assertEqual(calls, [])
+        permission = (CountedPermission & CountedPermission)()
+        for _ in range(3):
+            permission.has_permission(request, None)
+            permission.has_object_permission(request, None, self.test_task)
+        self.assertEqual(calls, ["permission", "object"])
+
+
+class TestDeveloperTasksInProjectQueries(TestBaseClass):
+    """Test developer tasks in a project are loaded with a single query"""
+
+    url = "/api/v1/project-manager/tasks/1/test-project-01-2024"
+
+    def test_get_request_resolves_the_project_code_once(self):
+        # User authentication, project id and tasks.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 2)
+        self.test_task.save()
+        # The project id comes from the cache, not from a join.
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(len(context.captured_queries), 2)
+        sql = context.captured_queries[1]["sql"]
+        self.assertIn(f'"project_id" = {self.test_project.id}', sql)
+        self.assertNotIn('"project_manager_project"."code" =', sql)
+        self.assertEqual(len(response.data), 2)
+
+    def test_get_request_without_tasks_returns_404_after_one_query(self):
+        self.client.get(self.url)
+        # User authentication and tasks.
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/v1/project-manager/tasks/3/test-project-01-2024"
+            )
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_request_unknown_project_returns_404_without_tasks_query(
+        self,
+    ):
+        # User authentication and project id.
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/v1/project-manager/tasks/1/unknown-project"
+            )
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_request_paginated_returns_tasks(self):
+        response = self.client.get(f"{self.url}?page_size=1")
+        self.assertEqual(len(response.data["results"]), 1)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class TestAvailableDevelopersRanking(TestBaseClass):
+    """Test available developers ranked by their number of open tasks"""
+
+    url = "/api/v1/project-manager/available-developers/"
+
+    def test_get_request_default_returns_developers_without_open_tasks(self):
+        # Completed and deleted tasks don't count as open tasks.
+        self.test_task_3.is_completed = True
+        self.test_task_3.save()
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [developer["id"] for developer in response.data], [3, 2]
+        )
+        self.assertEqual(response.data[0]["open_tasks"], 0)
+
+    def test_get_request_with_max_open_ranks_by_open_tasks(self):
+        # User authentication and the ranked developers.
+        with self.assertNumQueries(2):
+            response = self.client.get(f"{self.url}?max_open=2")
+        self.assertEqual(
+            [
+                (developer["id"], developer["open_tasks"])
+                for developer in response.data
+            ],
+            [(3, 0), (2, 1), (1, 2)],
+        )
+        response = self.client.get(f"{self.url}?max_open=1")
+        self.assertEqual(
+            [developer["id"] for developer in response.data], [3, 2]
+        )
+
+    def test_get_request_with_limit_returns_the_least_busy(self):
+        response = self.client.get(f"{self.url}?max_open=5&limit=1")
+        self.assertEqual([developer["id"] for developer in response.data], [3])
+
+    def test_get_request_with_invalid_params_returns_400(self):
+        for query in ("max_open=-1", "max_open=many", "limit=-5"):
+            response = self.client.get(f"{self.url}?{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_new_task_updates_the_cached_ranking(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 1)
+        Task.objects.create(
+            code="test-task-04-2024",
+            title="Test Task number 4",
+            description="Task Description for task 4",
+            developer=self.test_dev_user_3,
+            project=self.test_project,
+            final_date=date(9999, 10, 10),
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 0)
+
+
+class TestProjectStats(TestBaseClass):
+    """Test project stats are computed in one query and cached"""
+
+    url = "/api/v1/project-manager/projects/test-project-01-2024/stats"
+
+    def test_get_request_returns_project_stats(self):
+        self.test_task_3.is_completed = True
+        self.test_task_3.save()
+        # update() skips the validation of past final dates.
+        Task.objects.filter(pk=self.test_task_2.pk).update(
+            final_date=date(2020, 1, 1)
+        )
+        # User authentication, project id and the stats.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["code"], "test-project-01-2024")
+        self.assertEqual(response.data["tasks"], 3)
+        self.assertEqual(response.data["open_tasks"], 2)
+        self.assertEqual(response.data["completed_tasks"], 1)
+        self.assertEqual(response.data["completion_percentage"], 33.33)
+        self.assertEqual(response.data["overdue_tasks"], 1)
+        self.assertEqual(response.data["next_deadline"], "9999-10-10")
+        self.assertEqual(
+            [
+                (
+                    developer["id"],
+                    developer["open_tasks"],
+                    developer["completed_tasks"],
+                )
+                for developer in response.data["developers"]
+            ],
+            [(1, 2, 0), (2, 0, 1)],
+        )
+
+    def test_get_request_of_project_without_tasks(self):
+        Task.objects.update(is_deleted=True)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["tasks"], 0)
+        self.assertEqual(response.data["completion_percentage"], 0.0)
+        self.assertIsNone(response.data["next_deadline"])
+        self.assertEqual(response.data["developers"], [])
+
+    def test_get_request_of_missing_or_disabled_project_returns_404(self):
+        response = self.client.get(
+            "/api/v1/project-manager/projects/missing-project/stats"
+        )
+        self.assertEqual(response.status_code, 404)
+        self.client.delete(
+            "/api/v1/project-manager/projects/test-project-01-2024/disable"
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_cached_stats_are_cleared_by_task_changes(self):
+        self.client.get(self.url)
+        # Only the user authentication.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["completed_tasks"], 0)
+        self.test_task.is_completed = True
+        self.test_task.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["completed_tasks"], 1)
+        self.client.patch(
+            "/api/v1/project-manager/tasks/bulk-update",
+            data={
+                "filter": {"project": "test-project-01-2024"},
+                "changes": {"is_completed": True},
+            },
+            format="json",
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["completion_percentage"], 100.0)
+
+
+class TestProjectDashboard(TestBaseClass):
+    """Test the dashboard is read from the refreshed materialized view"""
+
+    url = "/api/v1/project-manager/dashboard/"
+
+    def test_get_request_returns_the_last_refresh(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data, [])
+        refresh_project_dashboard()
+        # User authentication and the view rows.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        project = response.data[0]
+        self.assertEqual(project["code"], "test-project-01-2024")
+        self.assertEqual(project["project_manager"], 4)
+        self.assertEqual(project["tasks"], 3)
+        self.assertEqual(project["open_tasks"], 3)
+        self.assertEqual(project["overdue_tasks"], 0)
+        self.assertEqual(
+            [
+                (developer["id"], developer["open_tasks"])
+                for developer in project["developers"]
+            ],
+            [(1, 2), (2, 1)],
+        )
+
+    def test_changes_are_visible_after_the_next_refresh(self):
+        refresh_project_dashboard()
+        self.test_task.is_completed = True
+        self.test_task.save()
+        # update() skips the validation of past final dates.
+        Task.objects.filter(pk=self.test_task_3.pk).update(
+            final_date=date(2020, 1, 1)
+        )
+        self.create_projects_with_tasks(2)
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["completed_tasks"], 0)
+        refresh_project_dashboard()
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 3)
+        project = response.data[-1]
+        self.assertEqual(project["completed_tasks"], 1)
+        self.assertEqual(project["overdue_tasks"], 1)
+
+    def test_get_request_dev_user_authenticated_returns_403(self):
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.test_dev_user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}"
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+
+class TestSearch(TestBaseClass):
+    """Test full-text search over projects and tasks with ?q="""
+
+    def test_get_request_ranks_title_matches_first(self):
+        self.test_task_2.description = "Prepare the release notes"
+        self.test_task_2.save()
+        self.test_task_3.title = "Release the new version"
+        self.test_task_3.save()
+        response = self.client.get("/api/v1/project-manager/tasks/?q=release")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [task["code"] for task in response.data["results"]],
+            ["test-task-03-2024", "test-task-02-2024"],
+        )
+
+    def test_get_request_search_is_paginated(self):
+        self.create_projects_with_tasks(3, tasks_per_project=2)
+        url = "/api/v1/project-manager/tasks/?q=task&page_size=5"
+        response = self.client.get(url)
+        codes = [task["code"] for task in response.data["results"]]
+        self.assertEqual(len(codes), 5)
+        response = self.client.get(response.data["next"])
+        codes += [task["code"] for task in response.data["results"]]
+        self.assertIsNone(response.data["next"])
+        self.assertEqual(len(codes), 9)
+        self.assertEqual(len(set(codes)), 9)
+
+    def test_get_request_searches_projects(self):
+        self.create_projects_with_tasks(2)
+        response = self.client.get(
+            "/api/v1/project-manager/projects/?q=description&embed=none"
+        )
+        self.assertEqual(len(response.data["results"]), 3)
+        response = self.client.get(
+            '/api/v1/project-manager/projects/?q="test project"&embed=none'
+        )
+        self.assertEqual(
+            [project["code"] for project in response.data["results"]],
+            ["test-project-01-2024"],
+        )
+
+    def test_bulk_created_and_inactive_tasks(self):
+        data = [
+            {
+                "title": f"Migrate database {i}",
+                "description": "Task created in bulk to test search",
+                "project": self.test_project.code,
+                "developer": self.test_dev_user.id,
+                "is_completed": False,
+                "final_date": "9999-12-12",
+            }
+            for i in range(2)
+        ]
+        self.client.post(
+            "/api/v1/project-manager/tasks/", data=data, format="json"
+        )
+        url = "/api/v1/project-manager/tasks/?q=migrate"
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 2)
+        code = response.data["results"][0]["code"]
+        self.client.delete(f"/api/v1/project-manager/tasks/{code}/disable")
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class TestTaskFilters(TestBaseClass):
+    """Test the filters and orderings of GET /tasks/"""
+
+    url = "/api/v1/project-manager/tasks/"
+
+    def get_codes(self, query):
+        response = self.client.get(f"{self.url}?{query}")
+        self.assertEqual(response.status_code, 200)
+        results = response.data
+        if isinstance(results, dict):
+            results = results["results"]
+        return [task["code"] for task in results]
+
+    def test_get_request_filters_by_equality(self):
+        self.test_task.is_completed = True
+        self.test_task.save()
+        self.assertEqual(
+            self.get_codes("is_completed=true"), ["test-task-01-2024"]
+        )
+        self.assertEqual(
+            self.get_codes(f"developer={self.test_dev_user.id}"),
+            ["test-task-02-2024", "test-task-01-2024"],
+        )
+        self.assertEqual(
+            self.get_codes("project=test-project-01-2024&is_completed=false"),
+            ["test-task-03-2024", "test-task-02-2024"],
+        )
+        self.assertEqual(self.get_codes("project=missing-project"), [])
+
+    def test_get_request_filters_by_final_date_range(self):
+        Task.objects.filter(pk=self.test_task_2.pk).update(
+            final_date=date(9999, 1, 1)
+        )
+        Task.objects.filter(pk=self.test_task_3.pk).update(
+            final_date=date(9999, 5, 5)
+        )
+        # Deadline ranges are listed from the closest deadline.
+        self.assertEqual(
+            self.get_codes("final_date_after=9999-02-01"),
+            ["test-task-03-2024", "test-task-01-2024"],
+        )
+        self.assertEqual(
+            self.get_codes(
+                f"developer={self.test_dev_user.id}"
+                "&final_date_before=9999-02-01"
+            ),
+            ["test-task-02-2024"],
+        )
+
+    def test_get_request_orders_and_paginates(self):
+        self.create_projects_with_tasks(3, tasks_per_project=2)
+        query = "ordering=created_at&page_size=5"
+        response = self.client.get(f"{self.url}?{query}")
+        codes = [task["code"] for task in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        codes += [task["code"] for task in response.data["results"]]
+        self.assertIsNone(response.data["next"])
+        expected = list(
+            Task.objects.order_by("created_at", "pk").values_list(
+                "code", flat=True
+            )
+        )
+        self.assertEqual(codes, expected)
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(
+            [task["code"] for task in response.data["results"]],
+            expected[:5],
+        )
+
+    def test_get_request_pages_round_trip_in_every_ordering(self):
+        self.create_projects_with_tasks(3, tasks_per_project=2)
+        # Some tasks share their deadline, so the id breaks the ties.
+        for i, task in enumerate(Task.objects.order_by("pk")):
+            Task.objects.filter(pk=task.pk).update(
+                final_date=date(9999, 1, 1 + i % 3),
+                updated_at=timezone.now() - timedelta(hours=(i * 5) % 7),
+            )
+        for ordering in TaskListFilterSerializer().fields["ordering"].choices:
+            pk_ordering = "-pk" if ordering.startswith("-") else "pk"
+            expected = list(
+                Task.objects.order_by(ordering, pk_ordering).values_list(
+                    "code", flat=True
+                )
+            )
+            response = self.client.get(
+                f"{self.url}?ordering={ordering}&page_size=3"
+            )
+            pages = [[task["code"] for task in response.data["results"]]]
+            while response.data["next"]:
+                response = self.client.get(response.data["next"])
+                self.assertEqual(response.status_code, 200, ordering)
+                pages.append(
+                    [task["code"] for task in response.data["results"]]
+                )
+            self.assertEqual(sum(pages, []), expected, ordering)
+            for page in reversed(pages[:-1]):
+                response = self.client.get(response.data["previous"])
+                self.assertEqual(response.status_code, 200, ordering)
+                self.assertEqual(
+                    [task["code"] for task in response.data["results"]],
+                    page,
+                    ordering,
+                )
+            self.assertIsNone(response.data["previous"], ordering)
+
+    def test_get_request_unindexed_combination_returns_400(self):
+        for query in (
+            "project=test-project-01-2024&ordering=updated_at",
+            "developer=1&project=test-project-01-2024&is_completed=true",
+            "created_after=2024-01-01T00:00&ordering=final_date",
+            "created_after=2024-01-01T00:00&updated_after=2024-01-01T00:00",
+        ):
+            response = self.client.get(f"{self.url}?{query}")
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn("filters", response.data)
+
+    def test_get_request_invalid_values_return_400(self):
+        for query in (
+            "is_completed=maybe",
+            "developer=first",
+            "final_date_after=tomorrow",
+            "ordering=title",
+            "q=task&ordering=created_at",
+        ):
+            response = self.client.get(f"{self.url}?{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+
+class TestSync(TestBaseClass):
+    """Test GET /sync/ with ?updated_since="""
+
+    url = "/api/v1/project-manager/sync/"
+
+    def test_get_request_without_watermark_returns_active_rows(self):
+        self.test_task_3.is_active = False
+        self.test_task_3.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [project["code"] for project in response.data["projects"]],
+            ["test-project-01-2024"],
+        )
+        self.assertNotIn("tasks", response.data["projects"][0])
+        self.assertEqual(
+            [task["code"] for task in response.data["tasks"]],
+            ["test-task-01-2024", "test-task-02-2024"],
+        )
+        self.assertEqual(
+            response.data["tasks"][0]["project"], "test-project-01-2024"
+        )
+        self.assertEqual(response.data["removed_projects"], [])
+        self.assertEqual(response.data["removed_tasks"], [])
+
+    def test_get_request_returns_changes_and_tombstones(self):
+        since = timezone.now()
+        self.test_task_2.title = "Changed title"
+        self.test_task_2.save()
+        self.test_task_3.is_deleted = True
+        self.test_task_3.is_active = False
+        self.test_task_3.save()
+        response = self.client.get(self.url, {"updated_since": since})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["projects"], [])
+        self.assertEqual(
+            [task["title"] for task in response.data["tasks"]],
+            ["Changed title"],
+        )
+        self.assertEqual(
+            response.data["removed_tasks"],
+            [
+                {
+                    "code": "test-task-03-2024",
+                    "is_active": False,
+                    "is_deleted": True,
+                    "updated_at": response.data["removed_tasks"][0][
+                        "updated_at"
+                    ],
+                }
+            ],
+        )
+
+    def test_watermark_overlaps_recent_changes(self):
+        response = self.client.get(self.url)
+        watermark = parse_datetime(response.data["watermark"])
+        overlap = timedelta(seconds=settings.SYNC_WATERMARK_OVERLAP)
+        self.assertLessEqual(watermark, timezone.now() - overlap)
+        # Rows changed within the overlap are returned again.
+        response = self.client.get(self.url, {"updated_since": watermark})
+        self.assertEqual(len(response.data["tasks"]), 3)
+
+    def test_get_request_runs_in_a_fixed_number_of_queries(self):
+        self.create_projects_with_tasks(3)
+        # User, savepoint, statement timestamp, projects, tasks and release.
+        with self.assertNumQueries(6):
+            self.client.get(self.url, {"updated_since": "2024-01-01T00:00Z"})
+
+    def test_get_request_invalid_watermark_returns_400(self):
+        response = self.client.get(self.url, {"updated_since": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("updated_since", response.data)
+
+
+class TestSyncConcurrency(APITransactionTestCase):
+    """Test changes committed during a sync are in the next one"""
+
+    url = "/api/v1/project-manager/sync/"
+
+    def setUp(self):
+        self.test_dev_user = User.objects.create_user(
+            email="robert@gmail.com",
+            first_name="Robert",
+            last_name="Lopez",
+            role="D",
+            mobile_phone="+53 59876543",
+            password="SecurePass78*01",
+        )
+        self.test_pm_user = User.objects.create_user(
+            email="dany@gmail.com",
+            first_name="Daniel",
+            last_name="Lopez",
+            role="P",
+            mobile_phone="+53 54876543",
+            password="fcb",
+        )
+        self.test_project = Project.objects.create(
+            name="Test Project",
+            description="Project Description",
+            project_manager=self.test_pm_user,
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+        self.test_task = Task.objects.create(
+            title="Test Task",
+            description="Task Description",
+            developer=self.test_dev_user,
+            project=self.test_project,
+            final_date=date(9999, 10, 10),
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+        refresh = RefreshToken.for_user(self.test_pm_user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}"
+        )
+
+    def test_change_committed_after_the_snapshot_is_in_the_next_sync(self):
+        changed, synced = Event(), Event()
+        errors = []
+
+        def change_task():
+            try:
+                with transaction.atomic():
+                    task = Task.objects.get(pk=self.test_task.pk)
+                    task.title = "Changed title"
+                    task.save()
+                    changed.set()
+                    synced.wait(timeout=10)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        thread = Thread(target=change_task)
+        thread.start()
+        changed.wait(timeout=10)
+        # The change has an older updated_at but is not committed yet.
+        response = self.client.get(self.url)
+        synced.set()
+        thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(response.data["tasks"][0]["title"], "Test Task")
+        response = self.client.get(
+            self.url, {"updated_since": response.data["watermark"]}
+        )
+        self.assertEqual(
+            [task["title"] for task in response.data["tasks"]],
+            ["Changed title"],
+        )
+
+
+class TestCacheTags(TestBaseClass):
+    """Test changes only clear the cached lists showing the changed rows"""
+
+    def get_developer_tasks(self, developer):
+        return self.client.get(f"/api/v1/project-manager/tasks/{developer.id}")
+
+    def get_manager_projects(self, project_manager):
+        return self.client.get(
+            f"/api/v1/project-manager/projects/{project_manager.id}"
+        )
+
+    def test_task_save_keeps_the_lists_of_other_developers(self):
+        self.get_developer_tasks(self.test_dev_user)
+        self.get_developer_tasks(self.test_dev_user_2)
+        self.test_task.title = "Changed title"
+        self.test_task.save()
+        # Only the user authentication, the list is read from the cache.
+        with self.assertNumQueries(1):
+            self.get_developer_tasks(self.test_dev_user_2)
+        response = self.get_developer_tasks(self.test_dev_user)
+        self.assertIn(
+            "Changed title", [task["title"] for task in response.data]
+        )
+
+    def test_task_moved_to_another_developer_clears_both_lists(self):
+        self.get_developer_tasks(self.test_dev_user)
+        self.get_developer_tasks(self.test_dev_user_2)
+        self.test_task.developer = self.test_dev_user_2
+        self.test_task.save()
+        response = self.get_developer_tasks(self.test_dev_user)
+        self.assertEqual(len(response.data), 1)
+        response = self.get_developer_tasks(self.test_dev_user_2)
+        self.assertEqual(len(response.data), 2)
+
+    def test_project_changes_clear_the_lists_of_their_project_manager(self):
+        self.get_manager_projects(self.test_pm_user)
+        self.get_manager_projects(self.test_pm_user_2)
+        self.test_task_3.title = "Changed title"
+        self.test_task_3.save()
+        with self.assertNumQueries(1):
+            self.get_manager_projects(self.test_pm_user_2)
+        self.test_project.project_manager = self.test_pm_user_2
+        self.test_project.save()
+        response = self.get_manager_projects(self.test_pm_user)
+        self.assertEqual(len(response.data), 0)
+        response = self.get_manager_projects(self.test_pm_user_2)
+        self.assertEqual(len(response.data), 1)
+
+    @override_settings(CACHE_STATS_ENABLED=True)
+    def test_cache_stats_command_reports_the_hit_rate(self):
+        call_command("cache_stats", "--reset", stdout=StringIO())
+        self.get_developer_tasks(self.test_dev_user)
+        self.get_developer_tasks(self.test_dev_user)
+        output = StringIO()
+        call_command("cache_stats", stdout=output)
+        self.assertIn(
+            "ListTasksByDeveloper: 1 hits, 1 misses, 50.0% hit rate",
+            output.getvalue(),
+        )
+
+    @override_settings(CACHE_STATS_ENABLED=False)
+    def test_lookups_are_not_counted_with_the_stats_disabled(self):
+        reset_stats()
+        self.get_developer_tasks(self.test_dev_user)
+        self.get_developer_tasks(self.test_dev_user)
+        self.assertEqual(get_stats(), {})
+        output = StringIO()
+        call_command("cache_stats", stdout=output)
+        self.assertIn("CACHE_STATS_ENABLED", output.getvalue())
+
+
+class TestCacheIdentity(TestBaseClass):
+    """Test cached lists are keyed by the role of the user, not its token"""
+
+    url = "/api/v1/project-manager/tasks/1"
+
+    def login(self, user):
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {str(refresh.access_token)}"
+        )
+
+    def test_users_of_the_same_role_share_entries(self):
+        self.client.get(self.url)
+        self.login(self.test_pm_user_2)
+        # Only the user authentication, the list is read from the cache.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 2)
+
+    @override_settings(CACHE_STATS_ENABLED=True)
+    def test_roles_and_new_tokens(self):
+        reset_stats()
+        self.client.get(self.url)
+        self.login(self.test_dev_user)
+        self.client.get(self.url)
+        # A new token of the same user reads the entry of its role.
+        self.login(self.test_dev_user)
+        self.client.get(self.url)
+        self.assertEqual(
+            get_stats()["ListTasksByDeveloper"], {"hits": 1, "misses": 2}
+        )
+
+    def test_user_scope_isolates_every_user(self):
+        pm_user, pm_user_2 = self.test_pm_user, self.test_pm_user_2
+        self.assertEqual(
+            get_identity(pm_user, "role"), get_identity(pm_user_2, "role")
+        )
+        self.assertNotEqual(
+            get_identity(pm_user, "user"), get_identity(pm_user_2, "user")
+        )
+        self.assertNotEqual(
+            get_identity(pm_user, "role"),
+            get_identity(self.test_dev_user, "role"),
+        )
+
+
+class TestCacheGenerations(TestBaseClass):
+    """Test cached pages are not served after the generation of a tag is lost"""
+
+    def test_lost_cache_generation_doesnt_serve_stale_pages(self):
+        response = self.client.get("/api/v1/project-manager/projects/")
+        self.assertEqual(len(response.data), 1)
+        # Changed without signals and with the generation evicted, the next
+        # generation still differs from the one of the cached page.
+        Project.objects.filter(pk=self.test_project.pk).update(is_active=False)
+        cache.delete(generation_cache_key("projects"))
+        response = self.client.get("/api/v1/project-manager/projects/")
+        self.assertEqual(len(response.data), 0)
+
+
+class TestConditionalRequests(TestBaseClass):
+    """Test ETags, If-None-Match, If-Modified-Since and If-Match"""
+
+    projects_url = "/api/v1/project-manager/projects/"
+    task_url = "/api/v1/project-manager/tasks/test-task-01-2024/"
+
+    def test_list_with_matching_etag_returns_304(self):
+        etag = self.client.get(self.projects_url)["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        # User authentication and the ETag probe of the projects and of
+        # their tasks, no rows are loaded.
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                self.projects_url, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_page_is_compared_with_its_rendered_etag(self):
+        url = f"{self.projects_url}?page_size=1"
+        etag = self.client.get(url)["ETag"]
+        # Only the user authentication, pages are not probed and this one
+        # is read from the cache with its ETag.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.test_task.title = "Changed title"
+        self.test_task.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_response_etag_matches_the_probe(self):
+        for url in (
+            self.projects_url,
+            f"{self.projects_url}?embed=none",
+            f"{self.projects_url}?fields=code,tasks",
+            "/api/v1/project-manager/tasks/",
+            self.task_url,
+            "/api/v1/project-manager/projects/test-project-01-2024/",
+        ):
+            etag = self.client.get(url)["ETag"]
+            # The cached pages are cleared, the 304 comes from the probe.
+            cache.clear()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+
+    def test_list_etag_changes_with_the_rows(self):
+        etag = self.client.get(self.projects_url)["ETag"]
+        # Tasks are shown inside the projects.
+        self.test_task.title = "Changed title"
+        self.test_task.save()
+        response = self.client.get(self.projects_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        tasks_url = "/api/v1/project-manager/tasks/"
+        etag = self.client.get(tasks_url)["ETag"]
+        self.test_task_3.is_deleted = True
+        self.test_task_3.save()
+        response = self.client.get(tasks_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+    def test_user_lists_with_matching_etag_return_304(self):
+        for url in (
+            f"/api/v1/project-manager/projects/{self.test_pm_user.id}",
+            f"/api/v1/project-manager/tasks/{self.test_dev_user.id}",
+            f"/api/v1/project-manager/tasks/{self.test_dev_user.id}/"
+            f"{self.test_project.code}",
+        ):
+            etag = self.client.get(url)["ETag"]
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+            self.test_task.title = f"Changed for {url}"
+            self.test_task.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertNotEqual(response["ETag"], etag, url)
+
+    def test_developer_tasks_in_project_without_tasks_returns_404(self):
+        response = self.client.get(
+            f"/api/v1/project-manager/tasks/{self.test_dev_user_3.id}/"
+            f"{self.test_project.code}",
+            HTTP_IF_NONE_MATCH="*",
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_etag_depends_on_the_query_params(self):
+        etag = self.client.get(self.task_url)["ETag"]
+        response = self.client.get(
+            f"{self.task_url}?fields=code", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_object_with_matching_etag_or_date_returns_304(self):
+        response = self.client.get(self.task_url)
+        self.assertIn("Last-Modified", response)
+        not_modified = self.client.get(
+            self.task_url, HTTP_IF_NONE_MATCH=f'W/{response["ETag"]}'
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        not_modified = self.client.get(
+            self.task_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_unknown_object_returns_404(self):
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/unknown/", HTTP_IF_NONE_MATCH="*"
+        )
+        self.assertEqual(response.status_code, 404)
+        response = self.client.patch(
+            "/api/v1/project-manager/tasks/unknown/",
+            data={"title": "Changed title"},
+            HTTP_IF_MATCH="*",
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_update_with_stale_etag_returns_412(self):
+        etag = self.client.get(self.task_url)["ETag"]
+        Task.objects.filter(pk=self.test_task.pk).update(
+            title="Changed by someone else", updated_at=timezone.now()
+        )
+        response = self.client.patch(
+            self.task_url, data={"title": "Changed title"}, HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 412)
+        self.test_task.refresh_from_db()
+        self.assertEqual(self.test_task.title, "Changed by someone else")
+
+    def test_update_with_current_etag_returns_the_new_etag(self):
+        etag = self.client.get(self.task_url)["ETag"]
+        response = self.client.patch(
+            self.task_url, data={"title": "Changed title"}, HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            response["ETag"], self.client.get(self.task_url)["ETag"]
+        )
+        # Weak ETags never match If-Match.
+        response = self.client.patch(
+            self.task_url,
+            data={"title": "Changed again"},
+            HTTP_IF_MATCH=f'W/{response["ETag"]}',
+        )
+        self.assertEqual(response.status_code, 412)
+
+
+class TestObjectCache(TestBaseClass):
+    """Test projects and tasks looked up by code are read from the cache"""
+
+    project_url = "/api/v1/project-manager/projects/test-project-01-2024/"
+    task_url = "/api/v1/project-manager/tasks/test-task-01-2024/"
+    unknown_url = "/api/v1/project-manager/tasks/unknown-task/"
+
+    def setUp(self):
+        # Entries of the previous tests are not rolled back with their rows.
+        cache.clear()
+        super().setUp()
+
+    def test_get_request_reads_the_object_from_the_cache(self):
+        # Only the user authentication, the task was written through when
+        # it was created.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.task_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["project"], self.test_project.code)
+        # User authentication and the tasks, which are not cached with the
+        # project.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.project_url)
+        self.assertEqual(len(response.data["tasks"]), 3)
+
+    def test_saved_objects_are_written_through(self):
+        response = self.client.patch(
+            self.task_url, data={"title": "Changed title"}
+        )
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.task_url)
+        self.assertEqual(response.data["title"], "Changed title")
+
+        self.test_task_2.title = "Changed outside the API"
+        self.test_task_2.save()
+        response = self.client.get(
+            "/api/v1/project-manager/tasks/test-task-02-2024/"
+        )
+        self.assertEqual(response.data["title"], "Changed outside the API")
+
+    def test_only_the_project_is_cached_with_tasks(self):
+        self.client.patch(
+            self.task_url, data={"developer": self.test_dev_user_2.id}
+        )
+        (key,) = object_cache_keys(Task, [self.test_task.code])
+        task = cache.get(key)
+        # Users, like the developer, are not stored with the task.
+        self.assertEqual(set(task._state.fields_cache), {"project"})
+        self.assertEqual(task.project._state.fields_cache, {})
+        self.assertEqual(task.developer_id, self.test_dev_user_2.id)
+
+    def test_deleted_and_disabled_objects_are_evicted(self):
+        self.client.get(self.task_url)
+        self.client.delete(self.task_url)
+        self.assertEqual(self.client.get(self.task_url).status_code, 404)
+
+        self.client.get(self.project_url)
+        self.client.delete(f"{self.project_url[:-1]}/disable")
+        self.assertEqual(self.client.get(self.project_url).status_code, 404)
+        self.client.put(f"{self.project_url[:-1]}/enable")
+        self.assertEqual(self.client.get(self.project_url).status_code, 200)
+
+    def test_bulk_updated_objects_are_evicted(self):
+        self.client.get(self.task_url)
+        self.client.patch(
+            "/api/v1/project-manager/tasks/bulk-update",
+            data={"codes": [self.test_task.code], "changes": {"developer": 3}},
+            format="json",
+        )
+        self.assertEqual(self.client.get(self.task_url).data["developer"], 3)
+        # Tasks changed on cascade are not known, every task is evicted.
+        self.client.delete(
+            "/api/v1/project-manager/projects/test-project-01-2024/disable"
+            "?cascade=true"
+        )
+        self.assertEqual(self.client.get(self.task_url).status_code, 404)
+
+    def test_unknown_codes_are_cached_as_missing(self):
+        # User authentication and the lookup.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.unknown_url)
+        self.assertEqual(response.status_code, 404)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.unknown_url)
+        self.assertEqual(response.status_code, 404)
+        with self.assertNumQueries(1):
+            response = self.client.patch(
+                self.unknown_url, data={"title": "Changed title"}
+            )
+        self.assertEqual(response.status_code, 404)
+
+    def test_created_objects_replace_missing_entries(self):
+        self.client.get(self.unknown_url)
+        Task.objects.create(
+            code="unknown-task",
+            title="Task created after the lookup",
+            description="Task description",
+            developer=self.test_dev_user,
+            project=self.test_project,
+            final_date=date(9999, 10, 10),
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+        response = self.client.get(self.unknown_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["title"], "Task created after the lookup"
+        )
@@ -1,9 +1,27 @@
-from django.test import TestCase
+import os
+from threading import Barrier, Thread
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.db import connection, connections, transaction
+from django.db.models import Exists, OuterRef
 from django.db.utils import IntegrityError
 from django.core.exceptions import ValidationError
 from datetime import date
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from project_manager.filters import TaskFilterBackend
 from project_manager.models import Project, Task, EmailLog
+from project_manager.validators import (
+    validate_user_is_developer,
+    validate_user_is_project_manager,
+)
+from project_manager.utils import (
+    CODE_GENERATION_ATTEMPTS,
+    bulk_create_with_unique_slug_codes,
+)
 
 User = get_user_model()
 
@@ -175,6 +193,18 @@ class TestProject(TestCase):
             new_project.full_clean()
             new_project.save()
 
+    def test_save_with_update_fields_only_writes_those_fields(self):
+        Project.objects.filter(pk=self.test_project.pk).update(
+            description="Changed by another request"
+        )
+        self.test_project.name = "Renamed Project"
+        self.test_project.save(update_fields=["name"])
+        self.test_project.refresh_from_db()
+        self.assertEqual(self.test_project.name, "Renamed Project")
+        self.assertEqual(
+            self.test_project.description, "Changed by another request"
+        )
+
 
 class TestTask(TestCase):
     """Test Task model to check work properly"""
@@ -401,6 +431,43 @@ class TestTask(TestCase):
             new_task.full_clean()
 
 
+class TestValidators(TestCase):
+    """Test role validators accept a user or a user id"""
+
+    def setUp(self):
+        self.test_dev_user = User.objects.create_user(
+            email="robert@gmail.com",
+            first_name="Robert",
+            last_name="Lopez",
+            role="D",
+            mobile_phone="+53 59876543",
+            password="1234",
+        )
+        self.test_pm_user = User.objects.create_user(
+            email="dany@gmail.com",
+            first_name="Daniel",
+            last_name="Lopez",
+            role="P",
+            mobile_phone="+53 54876543",
+            password="fcb",
+        )
+
+    def test_validators_with_an_instance_dont_query_the_user(self):
+        with self.assertNumQueries(0):
+            validate_user_is_developer(self.test_dev_user)
+            validate_user_is_project_manager(self.test_pm_user)
+            with self.assertRaises(ValidationError):
+                validate_user_is_developer(self.test_pm_user)
+            with self.assertRaises(ValidationError):
+                validate_user_is_project_manager(self.test_dev_user)
+
+    def test_validators_with_an_id_fetch_the_user(self):
+        with self.assertNumQueries(1):
+            validate_user_is_developer(self.test_dev_user.id)
+        with self.assertRaises(ValidationError):
+            validate_user_is_project_manager(self.test_dev_user.id)
+
+
 class TestEmailLog(TestCase):
     """Test EmailLog model to check if works properly"""
 
@@ -472,3 +539,564 @@ class TestEmailLog(TestCase):
                 destination_email=self.test_dev_user.email,
                 delivered=True,
             )
+
+
+class TestPartialIndexes(TestCase):
+    """Test that the views querysets are resolved with the partial indexes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_pm_user = User.objects.create_user(
+            email="dany@gmail.com",
+            first_name="Daniel",
+            last_name="Lopez",
+            role="P",
+            mobile_phone="+53 54876543",
+            password="fcb",
+        )
+        developers = User.objects.bulk_create(
+            [
+                User(
+                    email=f"developer{i}@gmail.com",
+                    first_name="Developer",
+                    last_name="Seed",
+                    role="D",
+                    mobile_phone=f"+53 5000{i:04d}",
+                    password="!",
+                )
+                for i in range(100)
+            ]
+        )
+        # Projects are spread over several project managers, so filtering
+        # by one of them is selective enough for its index.
+        project_managers = [cls.test_pm_user] + User.objects.bulk_create(
+            [
+                User(
+                    email=f"manager{i}@gmail.com",
+                    first_name="Manager",
+                    last_name="Seed",
+                    role="P",
+                    mobile_phone=f"+53 5100{i:04d}",
+                    password="!",
+                )
+                for i in range(19)
+            ]
+        )
+        projects = Project.objects.bulk_create(
+            [
+                Project(
+                    code=f"seed-project-{i}",
+                    name=f"Seed Project {i}",
+                    description="Seed project description",
+                    project_manager=project_managers[
+                        i % len(project_managers)
+                    ],
+                    created_by=cls.test_pm_user,
+                    updated_by=cls.test_pm_user,
+                    is_active=i % 5 != 0,
+                )
+                for i in range(200)
+            ]
+        )
+        Task.objects.bulk_create(
+            [
+                Task(
+                    code=f"seed-task-{i}",
+                    title=f"Seed Task {i}",
+                    description="Seed task description",
+                    developer=developers[i % len(developers)],
+                    project=projects[i % len(projects)],
+                    final_date=date(9999, 10, 10),
+                    created_by=cls.test_pm_user,
+                    updated_by=cls.test_pm_user,
+                    is_active=i % 5 != 0,
+                    is_deleted=i % 7 == 0,
+                )
+                for i in range(5000)
+            ]
+        )
+        cls.developer = developers[0]
+        cls.project = projects[1]
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, *index_names, competing=()):
+        # The seeded tables are small, sequential scans and sorts are
+        # disabled so the plan shows whether the filter and ordering can use
+        # the indexes. Competing indexes that could serve the same query are
+        # dropped, the planner choice between them depends on cost estimates,
+        # and the test transaction restores them.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_sort = off")
+            for name in competing:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+        plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in index_names), plan)
+
+    def test_project_list_uses_partial_index(self):
+        queryset = Project.objects.filter(
+            is_active=True, is_deleted=False
+        ).order_by("-created_at", "-id")[:50]
+        self.assertUsesIndex(queryset, "project_active_created_idx")
+
+    def test_projects_by_project_manager_uses_partial_index(self):
+        queryset = Project.objects.filter(
+            is_active=True,
+            is_deleted=False,
+            project_manager__id__exact=self.test_pm_user.id,
+        ).order_by("-created_at", "-id")[:50]
+        # The index on created_at serves the ordering, filtering the
+        # project manager afterwards.
+        self.assertUsesIndex(
+            queryset,
+            "project_active_pm_idx",
+            competing=("project_active_created_idx",),
+        )
+
+    def test_task_list_uses_partial_index(self):
+        queryset = Task.objects.filter(
+            is_active=True, is_deleted=False
+        ).order_by("-created_at", "-id")[:50]
+        self.assertUsesIndex(queryset, "task_active_created_idx")
+
+    def test_tasks_by_developer_uses_partial_index(self):
+        queryset = Task.objects.filter(
+            is_active=True,
+            is_deleted=False,
+            developer__id__exact=self.developer.id,
+        ).order_by("-created_at", "-id")[:50]
+        # Both indexes start with the developer column.
+        self.assertUsesIndex(
+            queryset,
+            "task_active_developer_idx",
+            "task_active_dev_project_idx",
+        )
+
+    def test_tasks_by_project_uses_partial_index(self):
+        queryset = Task.objects.filter(
+            is_active=True,
+            is_deleted=False,
+            project__id__exact=self.project.id,
+        ).order_by("-created_at", "-id")
+        self.assertUsesIndex(queryset, "task_active_project_idx")
+
+    def test_developer_tasks_in_project_uses_partial_index(self):
+        queryset = Task.objects.filter(
+            is_active=True,
+            is_deleted=False,
+            developer__id__exact=self.developer.id,
+            project__id__exact=self.project.id,
+        ).order_by("-created_at", "-id")
+        self.assertUsesIndex(queryset, "task_active_dev_project_idx")
+
+    def test_available_developers_use_open_tasks_partial_index(self):
+        open_tasks = Task.objects.filter(
+            developer=OuterRef("pk"),
+            is_active=True,
+            is_deleted=False,
+            is_completed=False,
+        )
+        queryset = User.objects.filter(
+            role__exact="D", is_active=True, deleted=False
+        ).filter(~Exists(open_tasks))
+        self.assertUsesIndex(queryset, "task_active_dev_done_idx")
+
+    def test_task_search_uses_partial_gin_index(self):
+        queryset = Task.objects.filter(
+            is_active=True, is_deleted=False
+        ).search("42")
+        self.assertUsesIndex(queryset, "task_active_search_idx")
+
+    def test_task_filter_combinations_use_partial_indexes(self):
+        values = {
+            "project": self.project.code,
+            "developer": self.developer.id,
+            "is_completed": "false",
+        }
+        ranges = {
+            "final_date": ("final_date_after", "2024-01-01"),
+            "created_at": ("created_after", "2024-01-01T00:00"),
+            "updated_at": ("updated_after", "2024-01-01T00:00"),
+        }
+        backend = TaskFilterBackend()
+        queryset = Task.objects.filter(is_active=True, is_deleted=False)
+        for columns, ordering in backend.get_index_paths():
+            if ordering not in ranges or not columns <= set(values):
+                continue
+            params = {column: values[column] for column in columns}
+            params[ranges[ordering][0]] = ranges[ordering][1]
+            params["ordering"] = ordering
+            request = Request(APIRequestFactory().get("/", params))
+            with self.subTest(params=params), transaction.atomic():
+                filtered = backend.filter_queryset(request, queryset, None)
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                    cursor.execute("SET LOCAL enable_sort = off")
+                plan = filtered[:50].explain()
+                self.assertNotIn("Seq Scan", plan)
+                self.assertNotIn("Sort", plan)
+
+
+class TestCodeGeneration(TestCase):
+    """Test codes rely on the unique constraint instead of a query"""
+
+    def setUp(self):
+        self.test_dev_user = User.objects.create_user(
+            email="robert@gmail.com",
+            first_name="Robert",
+            last_name="Lopez",
+            role="D",
+            mobile_phone="+53 59876543",
+            password="1234",
+        )
+        self.test_pm_user = User.objects.create_user(
+            email="dany@gmail.com",
+            first_name="Daniel",
+            last_name="Lopez",
+            role="P",
+            mobile_phone="+53 54876543",
+            password="fcb",
+        )
+        self.test_project = Project.objects.create(
+            code="taken-code",
+            name="Test Project",
+            description="Project Description",
+            project_manager=self.test_pm_user,
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+        Task.objects.create(
+            code="taken-code",
+            title="Test Task",
+            description="Task Description",
+            developer=self.test_dev_user,
+            project=self.test_project,
+            final_date=date(9999, 1, 30),
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+
+    def new_task(self, title="New Task"):
+        return Task(
+            title=title,
+            description="Task Description",
+            developer=self.test_dev_user,
+            project=self.test_project,
+            final_date=date(9999, 1, 30),
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+
+    def test_create_doesnt_check_the_code_with_a_query(self):
+        task = self.new_task()
+        with CaptureQueriesContext(connection) as context:
+            task.save()
+        statements = [query["sql"] for query in context.captured_queries]
+        self.assertEqual(
+            [sql.split()[0] for sql in statements],
+            # The UPDATE is the open tasks counter of the project.
+            ["SAVEPOINT", "INSERT", "UPDATE", "RELEASE"],
+        )
+        self.assertTrue(task.code.startswith("new-t-"))
+
+    @patch(
+        "project_manager.utils.generate_slug",
+        side_effect=["taken-code", "free-code"],
+    )
+    def test_task_code_collision_is_retried_with_a_new_code(self, _):
+        task = self.new_task()
+        task.save()
+        self.assertEqual(task.code, "free-code")
+        self.assertTrue(Task.objects.filter(code="free-code").exists())
+
+    @patch(
+        "project_manager.utils.generate_slug",
+        side_effect=["taken-code", "free-code"],
+    )
+    def test_project_code_collision_is_retried_with_a_new_code(self, _):
+        project = Project.objects.create(
+            name="Second Project",
+            description="Project Description",
+            project_manager=self.test_pm_user,
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+        self.assertEqual(project.code, "free-code")
+
+    @patch("project_manager.utils.generate_slug", return_value="taken-code")
+    def test_code_collisions_give_up_after_some_attempts(self, generate):
+        with self.assertRaises(IntegrityError):
+            self.new_task().save()
+        self.assertEqual(generate.call_count, CODE_GENERATION_ATTEMPTS)
+
+    @patch("project_manager.utils.generate_slug", return_value="free-code")
+    def test_other_integrity_errors_are_not_retried(self, generate):
+        task = self.new_task()
+        task.description = None
+        with self.assertRaises(IntegrityError):
+            task.save()
+        self.assertEqual(generate.call_count, 1)
+
+    @patch(
+        "project_manager.utils.generate_slug",
+        side_effect=["taken-code", "code-1", "code-2", "code-3"],
+    )
+    def test_bulk_create_regenerates_codes_on_a_collision(self, _):
+        tasks = [self.new_task(), self.new_task()]
+        bulk_create_with_unique_slug_codes(
+            model=Task,
+            instances=tasks,
+            names=[task.title for task in tasks],
+        )
+        self.assertEqual([task.code for task in tasks], ["code-2", "code-3"])
+        self.assertEqual(Task.objects.count(), 3)
+
+
+class TestTaskCounters(TestCase):
+    """Test the task counters of the projects follow every task change"""
+
+    def setUp(self):
+        self.test_dev_user = User.objects.create_user(
+            email="robert@gmail.com",
+            first_name="Robert",
+            last_name="Lopez",
+            role="D",
+            mobile_phone="+53 59876543",
+            password="1234",
+        )
+        self.test_pm_user = User.objects.create_user(
+            email="dany@gmail.com",
+            first_name="Daniel",
+            last_name="Lopez",
+            role="P",
+            mobile_phone="+53 54876543",
+            password="fcb",
+        )
+        self.test_project = self.new_project()
+
+    def new_project(self):
+        return Project.objects.create(
+            name="Test Project",
+            description="Project Description",
+            project_manager=self.test_pm_user,
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+
+    def new_task(self, project=None, **kwargs):
+        return Task(
+            title="Test Task",
+            description="Task Description",
+            developer=self.test_dev_user,
+            project=project or self.test_project,
+            final_date=date(9999, 1, 30),
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+            **kwargs,
+        )
+
+    def assertCounters(self, project, open_tasks, completed_tasks):
+        project.refresh_from_db()
+        self.assertEqual(
+            (project.open_tasks_count, project.completed_tasks_count),
+            (open_tasks, completed_tasks),
+        )
+
+    def test_created_tasks_are_counted(self):
+        self.new_task().save()
+        self.new_task(is_completed=True).save()
+        self.new_task(is_active=False).save()
+        self.assertCounters(self.test_project, 1, 1)
+
+    def test_saved_tasks_move_between_counters(self):
+        self.new_task().save()
+        task = Task.objects.get()
+        task.is_completed = True
+        task.save()
+        self.assertCounters(self.test_project, 0, 1)
+        task.is_deleted = True
+        task.save()
+        self.assertCounters(self.test_project, 0, 0)
+
+    def test_saved_tasks_move_between_projects(self):
+        self.new_task().save()
+        other_project = self.new_project()
+        task = Task.objects.get()
+        task.project = other_project
+        task.save()
+        self.assertCounters(self.test_project, 0, 0)
+        self.assertCounters(other_project, 1, 0)
+
+    def test_saving_other_fields_doesnt_update_counters(self):
+        self.new_task().save()
+        task = Task.objects.get()
+        task.title = "Renamed Task"
+        # The stored counted fields, locked, the update, and the project
+        # manager of the project, not loaded with the task, whose cached
+        # lists are cleared.
+        with self.assertNumQueries(3):
+            task.save()
+
+    def test_updates_and_transitions_move_counters(self):
+        for _ in range(3):
+            self.new_task().save()
+        Task.objects.all().update(is_completed=True)
+        self.assertCounters(self.test_project, 0, 3)
+        code = Task.objects.first().code
+        Task.objects.filter(code=code, is_active=True).transition(
+            self.test_pm_user, is_active=False
+        )
+        self.assertCounters(self.test_project, 0, 2)
+        Task.objects.filter(code=code, is_active=True).transition(
+            self.test_pm_user, is_active=False
+        )
+        self.assertCounters(self.test_project, 0, 2)
+
+    def test_project_saves_dont_overwrite_counters(self):
+        project = Project.objects.get(pk=self.test_project.pk)
+        self.new_task().save()
+        project.name = "Renamed Project"
+        project.save()
+        self.assertCounters(self.test_project, 1, 0)
+
+    def test_reconcile_command_recounts_the_counters(self):
+        self.new_task().save()
+        self.new_task(is_completed=True).save()
+        Project.objects.update(open_tasks_count=7, completed_tasks_count=0)
+        other_project = self.new_project()
+        call_command("reconcile_task_counters", stdout=open(os.devnull, "w"))
+        self.assertCounters(self.test_project, 1, 1)
+        self.assertCounters(other_project, 0, 0)
+        self.assertEqual(Project.objects.reconcile_task_counters(), 0)
+
+
+class TestTaskCountersConcurrency(TransactionTestCase):
+    """Test the task counters stay correct under concurrent writes"""
+
+    threads = 8
+    tasks_per_thread = 5
+
+    def setUp(self):
+        self.test_dev_user = User.objects.create_user(
+            email="robert@gmail.com",
+            first_name="Robert",
+            last_name="Lopez",
+            role="D",
+            mobile_phone="+53 59876543",
+            password="1234",
+        )
+        self.test_pm_user = User.objects.create_user(
+            email="dany@gmail.com",
+            first_name="Daniel",
+            last_name="Lopez",
+            role="P",
+            mobile_phone="+53 54876543",
+            password="fcb",
+        )
+        self.test_project = Project.objects.create(
+            name="Test Project",
+            description="Project Description",
+            project_manager=self.test_pm_user,
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+
+    def run_concurrently(self, target):
+        """Run target in every thread at the same time"""
+        barrier = Barrier(self.threads)
+        errors = []
+
+        def run(index):
+            try:
+                barrier.wait()
+                target(index)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        threads = [
+            Thread(target=run, args=(index,)) for index in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def assertCountersMatchTasks(self):
+        project = Project.objects.get(pk=self.test_project.pk)
+        counters = (project.open_tasks_count, project.completed_tasks_count)
+        self.assertEqual(Project.objects.reconcile_task_counters(), 0)
+        return counters
+
+    def create_tasks(self, index):
+        for number in range(self.tasks_per_thread):
+            Task(
+                title=f"Task {index} {number}",
+                description="Task Description",
+                developer=self.test_dev_user,
+                project=self.test_project,
+                final_date=date(9999, 1, 30),
+                is_completed=bool(number % 2),
+                created_by=self.test_pm_user,
+                updated_by=self.test_pm_user,
+            ).save()
+
+    def test_concurrent_creates_and_saves(self):
+        def create_and_complete(index):
+            self.create_tasks(index)
+            for task in Task.objects.filter(
+                title__startswith=f"Task {index} "
+            ):
+                task.is_completed = not task.is_completed
+                task.save()
+
+        self.run_concurrently(create_and_complete)
+        # Every thread creates 3 open and 2 completed tasks, then swaps them.
+        self.assertEqual(
+            self.assertCountersMatchTasks(),
+            (self.threads * 2, self.threads * 3),
+        )
+
+    def test_concurrent_saves_of_the_same_task(self):
+        self.create_tasks(0)
+        task = Task.objects.filter(is_completed=False).first()
+        loaded = Barrier(self.threads)
+
+        def complete(index):
+            # Every thread loads the open task before any of them saves it.
+            instance = Task.objects.get(pk=task.pk)
+            loaded.wait()
+            instance.is_completed = True
+            instance.save()
+
+        self.run_concurrently(complete)
+        # The task is moved from open to completed only once.
+        self.assertEqual(self.assertCountersMatchTasks(), (2, 3))
+
+    def test_concurrent_transitions_are_counted_once(self):
+        self.create_tasks(0)
+        codes = list(Task.objects.values_list("code", flat=True))
+
+        def disable_all(index):
+            for code in codes:
+                Task.objects.filter(code=code, is_active=True).transition(
+                    self.test_pm_user, is_active=False
+                )
+
+        self.run_concurrently(disable_all)
+        self.assertEqual(self.assertCountersMatchTasks(), (0, 0))
+
+    def test_concurrent_bulk_updates(self):
+        for index in range(self.threads):
+            self.create_tasks(index)
+
+        def toggle(index):
+            Task.objects.filter(title__startswith=f"Task {index % 2}").update(
+                is_completed=bool(index % 2)
+            )
+
+        self.run_concurrently(toggle)
+        self.assertCountersMatchTasks()
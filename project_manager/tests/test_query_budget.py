@@ -0,0 +1,564 @@
+import os
+import sys
+import time
+from datetime import date
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from api.cache import get_stats, reset_stats
+from project_manager.models import Project, ProjectDashboard, Task
+from project_manager.utils import generate_slug
+from project_manager.tests.test_endpoints import TestBaseClass
+
+User = get_user_model()
+
+# Number of seeded tasks for every round, projects and developers grow with
+# them. Larger datasets are opt-in, e.g. QUERY_BUDGET_SIZES=10,1000,50000.
+DATASET_SIZES = tuple(
+    int(size)
+    for size in os.environ.get("QUERY_BUDGET_SIZES", "10,1000").split(",")
+)
+
+# The table of every endpoint is only written when asked for.
+WRITE_REPORT = bool(os.environ.get("QUERY_BUDGET_REPORT"))
+
+
+class TestQueryBudget(TestBaseClass):
+    """Check that the number of queries of every endpoint doesn't grow with the number of rows"""
+
+    def setUp(self):
+        super().setUp()
+        self.inactive_project = Project.objects.create(
+            code="inactive-project-01-2024",
+            name="Inactive Project",
+            description="Inactive project description",
+            project_manager=self.test_pm_user,
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+            is_active=False,
+        )
+        self.inactive_task = Task.objects.create(
+            code="inactive-task-01-2024",
+            title="Inactive Task",
+            description="Inactive task description",
+            developer=self.test_dev_user,
+            project=self.test_project,
+            final_date=date(9999, 10, 10),
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+            is_active=False,
+        )
+        self.seeded_tasks = 0
+        self.seeded_projects = 0
+        self.seeded_developers = 0
+
+    def get_endpoints(self):
+        """Every route of the API as (name, method, url, data)"""
+        task_data = {
+            "title": "Budget Task",
+            "description": "Task created to measure queries",
+            "project": self.test_project.code,
+            "developer": self.test_dev_user.id,
+            "is_completed": False,
+            "final_date": "9999-12-12",
+        }
+        project_data = {
+            "name": "Budget Project",
+            "description": "Project created to measure queries",
+            "project_manager": self.test_pm_user.id,
+        }
+        user_data = {
+            "email": "budget@gmail.com",
+            "first_name": "Budget",
+            "last_name": "User",
+            "role": "Developer",
+            "mobile_phone": "+53 51112222",
+            "password": "Budget*Pass2024",
+        }
+        user = f"/api/v1/accounts/users/{self.test_pm_user.pk}"
+        project = f"/api/v1/project-manager/projects/{self.test_project.code}"
+        task = f"/api/v1/project-manager/tasks/{self.test_task.code}"
+        return [
+            # Accounts urls.
+            ("list users", "get", "/api/v1/accounts/users/", None),
+            ("create user", "post", "/api/v1/accounts/users/", user_data),
+            ("retrieve user", "get", user, None),
+            ("update user", "patch", user, {"first_name": "Updated"}),
+            ("delete user", "delete", user, None),
+            (
+                "list project managers",
+                "get",
+                "/api/v1/accounts/users/p/",
+                None,
+            ),
+            ("list developers", "get", "/api/v1/accounts/users/d/", None),
+            (
+                "login",
+                "post",
+                "/api/v1/accounts/users/login",
+                {"email": "robert@gmail.com", "password": "SecurePass78*01"},
+            ),
+            # Projects urls.
+            (
+                "list projects",
+                "get",
+                "/api/v1/project-manager/projects/",
+                None,
+            ),
+            (
+                "create project",
+                "post",
+                "/api/v1/project-manager/projects/",
+                project_data,
+            ),
+            (
+                "search projects",
+                "get",
+                "/api/v1/project-manager/projects/?q=seed",
+                None,
+            ),
+            ("retrieve project", "get", f"{project}/", None),
+            ("update project", "put", f"{project}/", project_data),
+            (
+                "partial update project",
+                "patch",
+                f"{project}/",
+                {"name": "Updated"},
+            ),
+            ("delete project", "delete", f"{project}/", None),
+            (
+                "enable project",
+                "put",
+                "/api/v1/project-manager/projects/"
+                f"{self.inactive_project.code}/enable",
+                None,
+            ),
+            ("disable project", "delete", f"{project}/disable", None),
+            ("project stats", "get", f"{project}/stats", None),
+            (
+                "disable project and its tasks",
+                "delete",
+                f"{project}/disable?cascade=true",
+                None,
+            ),
+            (
+                "list projects by project manager",
+                "get",
+                f"/api/v1/project-manager/projects/{self.test_pm_user.id}",
+                None,
+            ),
+            # Tasks urls.
+            ("list tasks", "get", "/api/v1/project-manager/tasks/", None),
+            (
+                "search tasks",
+                "get",
+                "/api/v1/project-manager/tasks/?q=seed",
+                None,
+            ),
+            (
+                "filter tasks",
+                "get",
+                "/api/v1/project-manager/tasks/"
+                f"?project={self.test_project.code}&is_completed=false"
+                "&ordering=-created_at&page_size=50",
+                None,
+            ),
+            (
+                "create task",
+                "post",
+                "/api/v1/project-manager/tasks/",
+                task_data,
+            ),
+            (
+                "bulk create tasks",
+                "post",
+                "/api/v1/project-manager/tasks/",
+                [task_data] * 10,
+            ),
+            (
+                "bulk update tasks",
+                "patch",
+                "/api/v1/project-manager/tasks/bulk-update",
+                {
+                    "filter": {"project": self.test_project.code},
+                    "changes": {"is_completed": True},
+                },
+            ),
+            ("retrieve task", "get", f"{task}/", None),
+            ("update task", "put", f"{task}/", task_data),
+            (
+                "partial update task",
+                "patch",
+                f"{task}/",
+                {"title": "Updated"},
+            ),
+            ("delete task", "delete", f"{task}/", None),
+            (
+                "enable task",
+                "put",
+                "/api/v1/project-manager/tasks/"
+                f"{self.inactive_task.code}/enable",
+                None,
+            ),
+            ("disable task", "delete", f"{task}/disable", None),
+            (
+                "list tasks by developer",
+                "get",
+                f"/api/v1/project-manager/tasks/{self.test_dev_user.id}",
+                None,
+            ),
+            (
+                "list developer tasks in project",
+                "get",
+                f"/api/v1/project-manager/tasks/{self.test_dev_user.id}/"
+                f"{self.test_project.code}",
+                None,
+            ),
+            # Extra urls.
+            (
+                "list available developers",
+                "get",
+                "/api/v1/project-manager/available-developers/",
+                None,
+            ),
+            (
+                "rank developers by open tasks",
+                "get",
+                "/api/v1/project-manager/available-developers/"
+                "?max_open=10&limit=20",
+                None,
+            ),
+            (
+                "project dashboard",
+                "get",
+                "/api/v1/project-manager/dashboard/",
+                None,
+            ),
+            ("full sync", "get", "/api/v1/project-manager/sync/", None),
+            (
+                "delta sync",
+                "get",
+                "/api/v1/project-manager/sync/"
+                "?updated_since=2024-01-01T00:00:00Z",
+                None,
+            ),
+        ]
+
+    def seed(self, tasks):
+        """Grow the dataset up to the given number of tasks"""
+        projects = max(tasks // 10, 1)
+        developers = max(tasks // 10, 1)
+        User.objects.bulk_create(
+            [
+                User(
+                    id=1000 + i,
+                    email=f"seed-developer-{i}@gmail.com",
+                    first_name="Seed",
+                    last_name="Developer",
+                    role="D",
+                    mobile_phone=f"+1 {i:09d}",
+                    password="!",
+                )
+                for i in range(self.seeded_developers, developers)
+            ]
+        )
+        Project.objects.bulk_create(
+            [
+                Project(
+                    code=f"seed-project-{i}",
+                    name=f"Seed Project {i}",
+                    description="Seed project description",
+                    project_manager=self.test_pm_user,
+                    created_by=self.test_pm_user,
+                    updated_by=self.test_pm_user,
+                )
+                for i in range(self.seeded_projects, projects)
+            ]
+        )
+        project_ids = list(
+            Project.objects.filter(code__startswith="seed-project-")
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        # Half of the tasks belong to the fixtures, so the lists filtered by
+        # developer and project grow too.
+        Task.objects.bulk_create(
+            [
+                Task(
+                    code=f"seed-task-{i}",
+                    title=f"Seed Task {i}",
+                    description="Seed task description",
+                    developer_id=(
+                        self.test_dev_user.id
+                        if i % 2
+                        else 1000 + i % developers
+                    ),
+                    project_id=(
+                        self.test_project.id
+                        if i % 2
+                        else project_ids[i % len(project_ids)]
+                    ),
+                    final_date=date(9999, 10, 10),
+                    created_by=self.test_pm_user,
+                    updated_by=self.test_pm_user,
+                )
+                for i in range(self.seeded_tasks, tasks)
+            ],
+            batch_size=5000,
+        )
+        self.seeded_tasks = tasks
+        self.seeded_projects = projects
+        self.seeded_developers = developers
+        # Fixtures and seeded users have explicit ids, the sequence is moved
+        # after them so the users created by the requests don't collide.
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [User]):
+                cursor.execute(sql)
+            cursor.execute("ANALYZE")
+        ProjectDashboard.refresh()
+
+    def measure(self, method, url, data):
+        """Return query count, database time and wall-clock time of a request"""
+        cache.clear()
+        # Changes made by the request are rolled back, so every round and
+        # every endpoint starts from the same fixtures.
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                response = getattr(self.client, method)(
+                    url, data=data, format="json"
+                )
+                wall_time = time.perf_counter() - start
+            transaction.set_rollback(True)
+        self.assertLess(response.status_code, 400, f"{method} {url}")
+        db_time = sum(
+            float(query["time"]) for query in context.captured_queries
+        )
+        return len(context.captured_queries), db_time, wall_time
+
+    def report(self, results):
+        lines = ["", "Query budget per endpoint (queries / db ms / wall ms):"]
+        for name, rounds in results.items():
+            columns = "  ".join(
+                f"{size:>6}: {queries:>3} / {db * 1000:8.1f} / {wall * 1000:8.1f}"
+                for size, (queries, db, wall) in rounds.items()
+            )
+            lines.append(f"  {name:<34} {columns}")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def test_query_count_does_not_grow_with_the_number_of_rows(self):
+        endpoints = self.get_endpoints()
+        results = {name: {} for name, method, url, data in endpoints}
+        for size in DATASET_SIZES:
+            self.seed(size)
+            for name, method, url, data in endpoints:
+                results[name][size] = self.measure(method, url, data)
+        if WRITE_REPORT:
+            self.report(results)
+        for name, rounds in results.items():
+            counts = {size: queries for size, (queries, *_) in rounds.items()}
+            self.assertEqual(
+                len(set(counts.values())),
+                1,
+                f"{name} queries grow with the number of rows: {counts}",
+            )
+
+
+class TestCodeGenerationBenchmark(TransactionTestCase):
+    """Compare the create path with and without checking the code first"""
+
+    creates = 200
+
+    def setUp(self):
+        self.test_dev_user = User.objects.create_user(
+            email="robert@gmail.com",
+            first_name="Robert",
+            last_name="Lopez",
+            role="D",
+            mobile_phone="+53 59876543",
+            password="1234",
+        )
+        self.test_pm_user = User.objects.create_user(
+            email="dany@gmail.com",
+            first_name="Daniel",
+            last_name="Lopez",
+            role="P",
+            mobile_phone="+53 54876543",
+            password="fcb",
+        )
+        self.test_project = Project.objects.create(
+            name="Test Project",
+            description="Project Description",
+            project_manager=self.test_pm_user,
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+
+    def new_task(self):
+        return Task(
+            title="Benchmark Task",
+            description="Task created to measure the create path",
+            developer=self.test_dev_user,
+            project=self.test_project,
+            final_date=date(9999, 10, 10),
+            created_by=self.test_pm_user,
+            updated_by=self.test_pm_user,
+        )
+
+    def create_checking_the_code(self):
+        # Code generation before it relied on the unique constraint.
+        task = self.new_task()
+        task.code = generate_slug(task.title)
+        while Task.objects.filter(code__exact=task.code).exists():
+            task.code = generate_slug(task.title)
+        task.save()
+
+    def create(self):
+        self.new_task().save()
+
+    def measure(self, create):
+        """Return queries and wall-clock time per create"""
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            for _ in range(self.creates):
+                create()
+            wall_time = time.perf_counter() - start
+        return (
+            len(context.captured_queries) / self.creates,
+            wall_time / self.creates,
+        )
+
+    def test_create_path_saves_a_round_trip(self):
+        checked = self.measure(self.create_checking_the_code)
+        constrained = self.measure(self.create)
+        if WRITE_REPORT:
+            sys.stdout.write(
+                "\nTask create path (queries / wall ms per create):\n"
+                f"  exists() check    {checked[0]:.0f} / "
+                f"{checked[1] * 1000:.3f}\n"
+                f"  unique constraint {constrained[0]:.0f} / "
+                f"{constrained[1] * 1000:.3f}\n"
+            )
+        # Both paths also update the open tasks counter of the project.
+        self.assertEqual(checked[0], 3)
+        self.assertEqual(constrained[0], 2)
+
+
+class TestCacheInvalidationBenchmark(TestBaseClass):
+    """Compare the task write path invalidating with KEYS scans and with generations"""
+
+    saves = 20
+    keyspace_sizes = (1000, 10000, 50000)
+
+    def fill_cache(self, size):
+        cache.clear()
+        # Other cached entries, a KEYS scan reads all of them.
+        cache.set_many(
+            {f"benchmark:{i}": "cached" for i in range(size)}, timeout=600
+        )
+
+    def scan_invalidation(self, *tags):
+        # Invalidation before generations, the keys of the task and project
+        # views were looked up with KEYS and deleted.
+        for prefix in ("task", "project"):
+            cache.delete_many(cache.keys(f"*.{prefix}.*"))
+
+    def measure(self):
+        """Return cache commands and wall-clock time per task save"""
+        client = cache.client.get_client(write=True)
+        with patch.object(
+            client, "execute_command", wraps=client.execute_command
+        ) as commands:
+            start = time.perf_counter()
+            for _ in range(self.saves):
+                self.test_task.save()
+            wall_time = time.perf_counter() - start
+        names = {call.args[0] for call in commands.call_args_list}
+        return commands.call_count / self.saves, wall_time / self.saves, names
+
+    def report(self, results):
+        lines = ["", "Task save (cache commands / wall ms per save):"]
+        for size, (scan, generation) in results.items():
+            lines.append(
+                f"  {size:>6} keys  KEYS scan {scan[0]:.0f} / "
+                f"{scan[1] * 1000:.3f}  generations {generation[0]:.0f} / "
+                f"{generation[1] * 1000:.3f}"
+            )
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def test_write_latency_doesnt_grow_with_the_cached_keyspace(self):
+        results = {}
+        for size in self.keyspace_sizes:
+            self.fill_cache(size)
+            with patch(
+                "project_manager.signals.invalidate",
+                side_effect=self.scan_invalidation,
+            ):
+                scan = self.measure()
+            generation = self.measure()
+            results[size] = (scan, generation)
+        if WRITE_REPORT:
+            self.report(results)
+        commands = {size: gen[0] for size, (_, gen) in results.items()}
+        self.assertEqual(len(set(commands.values())), 1, commands)
+        for _, generation in results.values():
+            self.assertNotIn("KEYS", generation[2])
+
+
+@override_settings(CACHE_STATS_ENABLED=True)
+class TestCacheTagsBenchmark(TestBaseClass):
+    """Compare the hit rate of the developer and project manager lists with and without tags"""
+
+    rounds = 30
+
+    def coarse_tags(self, tasks):
+        # Invalidation before tags, every list was cleared by any task.
+        return ["tasks", "projects", "developer", "project-manager"]
+
+    def run_workload(self):
+        """Every user reads its list, then one of the tasks is changed"""
+        reset_stats()
+        urls = [
+            f"/api/v1/project-manager/tasks/{user.id}"
+            for user in (
+                self.test_dev_user,
+                self.test_dev_user_2,
+                self.test_dev_user_3,
+            )
+        ] + [
+            f"/api/v1/project-manager/projects/{user.id}"
+            for user in (self.test_pm_user, self.test_pm_user_2)
+        ]
+        tasks = [self.test_task, self.test_task_2, self.test_task_3]
+        for number in range(self.rounds):
+            for url in urls:
+                self.client.get(url)
+            task = tasks[number % len(tasks)]
+            task.title = f"Changed title {number}"
+            task.save()
+        stats = get_stats()
+        hits = sum(counts["hits"] for counts in stats.values())
+        lookups = sum(
+            counts["hits"] + counts["misses"] for counts in stats.values()
+        )
+        return hits / lookups
+
+    def test_tags_keep_the_lists_of_unchanged_rows(self):
+        with patch(
+            "project_manager.signals.get_task_cache_tags",
+            side_effect=self.coarse_tags,
+        ):
+            before = self.run_workload()
+        after = self.run_workload()
+        if WRITE_REPORT:
+            sys.stdout.write(
+                "\nDeveloper and project manager lists hit rate:\n"
+                f"  cleared by any task  {before:.1%}\n"
+                f"  cleared by tags      {after:.1%}\n"
+            )
+        self.assertEqual(before, 0)
+        self.assertGreater(after, 0.5)
@@ -7,12 +7,16 @@ from project_manager.views import (
     RetrieveUpdateDestroyProject,
     ListCreateTask,
     RetrieveUpdateDestroyTask,
+    BulkUpdateTasks,
     ListProjectsByProjectManager,
     ListTasksByDeveloper,
     ListDeveloperTasksInProject,
     ListAvailableDevelopers,
+    ListProjectDashboard,
+    SyncChanges,
     EnableProject,
     DisableProject,
+    RetrieveProjectStats,
     EnableTask,
     DisableTask,
 )
@@ -122,6 +126,10 @@ class TestUrls(TestCase):
         url = reverse("disable_project", args=["test-project-012024"])
         self.assertEquals(resolve(url).func.view_class, DisableProject)
 
+    def test_project_stats_url_resolve(self):
+        url = reverse("retrieve_project_stats", args=["test-project-012024"])
+        self.assertEquals(resolve(url).func.view_class, RetrieveProjectStats)
+
     def test_enable_task_url_resolve(self):
         url = reverse("enable_task", args=["test-task-012024"])
         self.assertEquals(resolve(url).func.view_class, EnableTask)
@@ -129,3 +137,15 @@ class TestUrls(TestCase):
     def test_disable_task_url_resolve(self):
         url = reverse("disable_task", args=["test-task-012024"])
         self.assertEquals(resolve(url).func.view_class, DisableTask)
+
+    def test_project_dashboard_url_resolve(self):
+        url = reverse("list_project_dashboard")
+        self.assertEquals(resolve(url).func.view_class, ListProjectDashboard)
+
+    def test_sync_changes_url_resolve(self):
+        url = reverse("sync_changes")
+        self.assertEquals(resolve(url).func.view_class, SyncChanges)
+
+    def test_bulk_update_tasks_url_resolve(self):
+        url = reverse("bulk_update_tasks")
+        self.assertEquals(resolve(url).func.view_class, BulkUpdateTasks)
@@ -4,12 +4,16 @@ from .views import (
     RetrieveUpdateDestroyProject,
     ListCreateTask,
     RetrieveUpdateDestroyTask,
+    BulkUpdateTasks,
     ListProjectsByProjectManager,
     ListTasksByDeveloper,
     ListDeveloperTasksInProject,
     ListAvailableDevelopers,
+    ListProjectDashboard,
     EnableProject,
     DisableProject,
+    RetrieveProjectStats,
+    SyncChanges,
     EnableTask,
     DisableTask,
 )
@@ -32,6 +36,11 @@ urlpatterns = [
         DisableProject.as_view(),
         name="disable_project",
     ),
+    path(
+        "projects/<slug:code>/stats",
+        RetrieveProjectStats.as_view(),
+        name="retrieve_project_stats",
+    ),
     path(
         "projects/<int:project_manager_id>",
         ListProjectsByProjectManager.as_view(),
@@ -39,6 +48,11 @@ urlpatterns = [
     ),
     # Tasks urls.
     path("tasks/", ListCreateTask.as_view(), name="list_create_task"),
+    path(
+        "tasks/bulk-update",
+        BulkUpdateTasks.as_view(),
+        name="bulk_update_tasks",
+    ),
     path(
         "tasks/<slug:code>/",
         RetrieveUpdateDestroyTask.as_view(),
@@ -64,4 +78,10 @@ urlpatterns = [
         ListAvailableDevelopers.as_view(),
         name="list_available_developers",
     ),
+    path(
+        "dashboard/",
+        ListProjectDashboard.as_view(),
+        name="list_project_dashboard",
+    ),
+    path("sync/", SyncChanges.as_view(), name="sync_changes"),
 ]
@@ -1,6 +1,11 @@
+from contextlib import contextmanager, nullcontext
+from django.db import IntegrityError, router, transaction
 from django.utils.text import slugify
 import uuid
 
+# Inserts retried with a new code before giving up on a collision.
+CODE_GENERATION_ATTEMPTS = 5
+
 
 def generate_slug(name):
     """Generate a slug based on part of a name and a unique identifier"""
@@ -9,12 +14,77 @@ def generate_slug(name):
     return f"{slugify_name}-{random_id}"
 
 
-def generate_unique_slug_code(name, model):
-    """Ensures that the generated slug is unique in the given model"""
-    code = generate_slug(name)
-    while model.objects.filter(code__exact=code).exists():
-        code = generate_slug(name)
-    return code
+def generate_slug_codes(names):
+    """Generate a slug for every name, ready for a bulk insert"""
+    return [generate_slug(name) for name in names]
+
+
+def is_code_collision(error, model):
+    """Tell if an IntegrityError comes from the unique code constraint"""
+    return f"{model._meta.db_table}_code_" in str(error)
+
+
+def code_collision_savepoint(model, using=None):
+    # Outside a transaction a failed INSERT leaves the connection usable, so
+    # no extra statements are sent. Inside one, a savepoint is needed to
+    # retry after the error.
+    using = using or router.db_for_write(model)
+    if transaction.get_connection(using).in_atomic_block:
+        return transaction.atomic(using=using)
+    return nullcontext()
+
+
+@contextmanager
+def repeatable_read(using=None):
+    """Run the block in a read only REPEATABLE READ transaction
+
+    All the queries of the block read the same snapshot, so rows committed
+    between them are not seen by some queries and missed by others. Inside
+    a transaction the isolation level can't be changed, the block joins it.
+    """
+    connection = transaction.get_connection(using)
+    outermost = not connection.in_atomic_block
+    with transaction.atomic(using=using):
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, "
+                    "READ ONLY"
+                )
+        yield
+
+
+def save_with_unique_slug_code(instance, name, save, using=None):
+    """Generate instance.code and insert it, relying on the unique constraint
+
+    Codes are not checked with a query before the insert, a new code is
+    generated and the insert retried if the constraint is violated.
+    """
+    model = type(instance)
+    for attempt in range(CODE_GENERATION_ATTEMPTS):
+        instance.code = generate_slug(name)
+        try:
+            with code_collision_savepoint(model, using):
+                return save()
+        except IntegrityError as error:
+            last_attempt = attempt == CODE_GENERATION_ATTEMPTS - 1
+            if last_attempt or not is_code_collision(error, model):
+                raise
+
+
+def bulk_create_with_unique_slug_codes(model, instances, names):
+    """bulk_create() generating the codes, retried on a code collision"""
+    for attempt in range(CODE_GENERATION_ATTEMPTS):
+        codes = generate_slug_codes(names)
+        for instance, code in zip(instances, codes):
+            instance.code = code
+        try:
+            with code_collision_savepoint(model):
+                return model.objects.bulk_create(instances)
+        except IntegrityError as error:
+            last_attempt = attempt == CODE_GENERATION_ATTEMPTS - 1
+            if last_attempt or not is_code_collision(error, model):
+                raise
 
 
 email_purpose = [("C", "Task Created"), ("F", "Task Finished")]
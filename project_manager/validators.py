@@ -2,8 +2,15 @@ from django.core.exceptions import ValidationError
 from accounts.models import User
 
 
+def get_user(user):
+    """Return the user of an instance or an id, only ids are fetched"""
+    if isinstance(user, User):
+        return user
+    return User.objects.filter(id=user).first()
+
+
 def validate_user_is_project_manager(user_id):
-    user = User.objects.filter(id=user_id).first()
+    user = get_user(user_id)
     if user.is_project_manager() is not True:
         raise ValidationError(
             f"{user.first_name}, is not a project manager, to lead a project "
@@ -12,8 +19,18 @@ def validate_user_is_project_manager(user_id):
 
 
 def validate_user_is_developer(user_id):
-    user = User.objects.filter(id=user_id).first()
+    user = get_user(user_id)
     if user.is_project_manager():
         raise ValidationError(
             f"{user.first_name}, is not a developer, to assign tasks you need a developer"
         )
+
+
+def validate_user_is_active(user):
+    if not user.is_active or user.deleted:
+        raise ValidationError(f"{user.first_name}, is not an active user")
+
+
+def validate_project_is_active(project):
+    if not project.is_active or project.is_deleted:
+        raise ValidationError(f"{project.code}, is not an active project")
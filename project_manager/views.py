@@ -1,30 +1,70 @@
+from datetime import timedelta
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Now
 from django.http import Http404
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_cookie
 from rest_framework import permissions
-from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.exceptions import MethodNotAllowed, ValidationError
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.generics import (
+    GenericAPIView,
     ListCreateAPIView,
     RetrieveUpdateDestroyAPIView,
     DestroyAPIView,
     ListAPIView,
     UpdateAPIView,
 )
-from api.serializers import ProjectSerializer, TaskSerializer, UserSerializer
-from .models import Project, Task
+from api.cache import cache_page
+from api.serializers import (
+    AvailableDeveloperSerializer,
+    ProjectDashboardSerializer,
+    ProjectSerializer,
+    ProjectStatsSerializer,
+    SyncQuerySerializer,
+    SyncSerializer,
+    TaskSerializer,
+    TaskBulkUpdateSerializer,
+)
+from .filters import TaskFilterBackend
+from .mixins import (
+    ConditionalRequestMixin,
+    ObjectCacheMixin,
+    SearchMixin,
+    SparseFieldsetViewMixin,
+    ProjectEmbedMixin,
+    StateTransitionMixin,
+)
+from .models import (
+    Project,
+    ProjectDashboard,
+    Task,
+    project_stats_cache_key,
+)
 from accounts.permissions import IsProjectManager
 from .permissions import IsTaskDeveloper, IsRequestedDeveloper
+from .signals import tasks_bulk_updated
+from .utils import repeatable_read
 
 User = get_user_model()
 
 
-class ListCreateProject(ListCreateAPIView):
-    queryset = Project.objects.filter(is_active=True, is_deleted=False)
+class ListCreateProject(
+    SearchMixin,
+    SparseFieldsetViewMixin,
+    ProjectEmbedMixin,
+    ConditionalRequestMixin,
+    ListCreateAPIView,
+):
+    queryset = Project.objects.filter(
+        is_active=True, is_deleted=False
+    ).with_active_tasks()
     serializer_class = ProjectSerializer
+    etag_related = ("tasks",)
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -41,16 +81,25 @@ class ListCreateProject(ListCreateAPIView):
             context["request"] = self.request
         return context
 
-    @method_decorator(cache_page(60 * 30, key_prefix="project"))
-    @method_decorator(vary_on_cookie)
+    @method_decorator(cache_page(60 * 30, "projects"))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class RetrieveUpdateDestroyProject(RetrieveUpdateDestroyAPIView):
-    queryset = Project.objects.filter(is_active=True, is_deleted=False)
+class RetrieveUpdateDestroyProject(
+    SparseFieldsetViewMixin,
+    ProjectEmbedMixin,
+    ObjectCacheMixin,
+    ConditionalRequestMixin,
+    StateTransitionMixin,
+    RetrieveUpdateDestroyAPIView,
+):
+    queryset = Project.objects.filter(
+        is_active=True, is_deleted=False
+    ).with_active_tasks()
     serializer_class = ProjectSerializer
     lookup_field = "code"
+    etag_related = ("tasks",)
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -68,19 +117,28 @@ class RetrieveUpdateDestroyProject(RetrieveUpdateDestroyAPIView):
         return context
 
     def destroy(self, request, *args, **kwargs):
-        project = self.get_object()
-        project.is_deleted = True
-        project.is_active = False
-        project.save()
+        counts = self.perform_transition(
+            {"is_deleted": True, "is_active": False},
+            task_filter={"is_deleted": False},
+        )
         return Response(
-            {"Response": "Project was successfully deleted"},
+            {"Response": "Project was successfully deleted", **counts},
             status=status.HTTP_204_NO_CONTENT,
         )
 
 
-class ListCreateTask(ListCreateAPIView):
-    queryset = Task.objects.filter(is_active=True, is_deleted=False)
+class ListCreateTask(
+    SearchMixin,
+    SparseFieldsetViewMixin,
+    ConditionalRequestMixin,
+    ListCreateAPIView,
+):
+    queryset = Task.objects.filter(
+        is_active=True, is_deleted=False
+    ).with_project_code()
     serializer_class = TaskSerializer
+    # The ?project= filter is the target of the more_tasks link of projects.
+    filter_backends = [TaskFilterBackend]
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -98,14 +156,29 @@ class ListCreateTask(ListCreateAPIView):
         context["fields"] = True
         return context
 
-    @method_decorator(cache_page(60 * 30, key_prefix="task"))
-    @method_decorator(vary_on_cookie)
+    def get_serializer(self, *args, **kwargs):
+        # A list of tasks is validated and created in bulk.
+        if isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+            kwargs["allow_empty"] = False
+            kwargs["max_length"] = settings.MAX_BULK_CREATE_TASKS
+        return super().get_serializer(*args, **kwargs)
+
+    @method_decorator(cache_page(60 * 30, "tasks"))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class RetrieveUpdateDestroyTask(RetrieveUpdateDestroyAPIView):
-    queryset = Task.objects.filter(is_active=True, is_deleted=False)
+class RetrieveUpdateDestroyTask(
+    SparseFieldsetViewMixin,
+    ObjectCacheMixin,
+    ConditionalRequestMixin,
+    StateTransitionMixin,
+    RetrieveUpdateDestroyAPIView,
+):
+    queryset = Task.objects.filter(
+        is_active=True, is_deleted=False
+    ).with_project_code()
     serializer_class = TaskSerializer
     lookup_field = "code"
 
@@ -130,19 +203,52 @@ class RetrieveUpdateDestroyTask(RetrieveUpdateDestroyAPIView):
         return context
 
     def destroy(self, request, *args, **kwargs):
-        task = self.get_object()
-        task.is_deleted = True
-        task.is_active = False
-        task.save()
+        counts = self.perform_transition(
+            {"is_deleted": True, "is_active": False}
+        )
         return Response(
-            {"Response": "Task was successfully deleted"},
+            {"Response": "Task was successfully deleted", **counts},
             status=status.HTTP_204_NO_CONTENT,
         )
 
 
-class ListProjectsByProjectManager(ListAPIView):
+class BulkUpdateTasks(GenericAPIView):
+    serializer_class = TaskBulkUpdateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        queryset = Task.objects.filter(
+            is_active=True, is_deleted=False, **serializer.get_lookup()
+        )
+        # Developers can only change their own tasks, the check is part of
+        # the UPDATE statement instead of a query per task.
+        if not (request.user.is_staff or request.user.is_project_manager()):
+            queryset = queryset.filter(developer__id__exact=request.user.id)
+        updated = queryset.update(
+            **serializer.get_changes(),
+            updated_by=request.user,
+            updated_at=Now(),
+        )
+        if updated:
+            tasks_bulk_updated.send(
+                sender=Task,
+                count=updated,
+                codes=serializer.validated_data.get("codes"),
+            )
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+
+class ListProjectsByProjectManager(
+    SparseFieldsetViewMixin,
+    ProjectEmbedMixin,
+    ConditionalRequestMixin,
+    ListAPIView,
+):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAdminUser | IsProjectManager]
+    etag_related = ("tasks",)
 
     def get_queryset(self):
         project_manager_id = int(self.kwargs["project_manager_id"])
@@ -150,16 +256,21 @@ class ListProjectsByProjectManager(ListAPIView):
             is_active=True,
             is_deleted=False,
             project_manager__id__exact=project_manager_id,
-        )
+        ).with_active_tasks()
         return queryset
 
-    @method_decorator(cache_page(60 * 30, key_prefix="project"))
-    @method_decorator(vary_on_cookie)
+    @method_decorator(
+        cache_page(
+            60 * 30, "project-manager", "project-manager:{project_manager_id}"
+        )
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class ListTasksByDeveloper(ListAPIView):
+class ListTasksByDeveloper(
+    SparseFieldsetViewMixin, ConditionalRequestMixin, ListAPIView
+):
     serializer_class = TaskSerializer
     permission_classes = [
         permissions.IsAdminUser | IsProjectManager | IsRequestedDeveloper
@@ -169,7 +280,7 @@ class ListTasksByDeveloper(ListAPIView):
         developer_id = int(self.kwargs["developer_id"])
         queryset = Task.objects.filter(
             is_active=True, is_deleted=False, developer__id__exact=developer_id
-        )
+        ).with_project_code()
         return queryset
 
     def get_serializer_context(self):
@@ -177,31 +288,40 @@ class ListTasksByDeveloper(ListAPIView):
         context["fields"] = True
         return context
 
-    @method_decorator(cache_page(60 * 30, key_prefix="task"))
-    @method_decorator(vary_on_cookie)
+    @method_decorator(
+        cache_page(60 * 30, "developer", "developer:{developer_id}")
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class ListDeveloperTasksInProject(ListAPIView):
+class ListDeveloperTasksInProject(
+    SparseFieldsetViewMixin, ConditionalRequestMixin, ListAPIView
+):
     serializer_class = TaskSerializer
     permission_classes = [
         permissions.IsAdminUser | IsProjectManager | IsRequestedDeveloper
     ]
 
+    not_found_message = (
+        "No tasks found for the given developer_id and project_code"
+    )
+
     def get_queryset(self):
         developer_id = int(self.kwargs["developer_id"])
-        project_code = self.kwargs["project_code"]
+        # The project is filtered by id, resolved from a cached map, so the
+        # query doesn't need to join projects to filter them.
+        project_id = Project.objects.get_id_by_code(
+            self.kwargs["project_code"]
+        )
+        if project_id is None:
+            raise Http404(self.not_found_message)
         queryset = Task.objects.filter(
             is_active=True,
             is_deleted=False,
             developer__id__exact=developer_id,
-            project__code__exact=project_code,
-        )
-        if not queryset.exists():
-            raise Http404(
-                "No tasks found for the given developer_id and project_code"
-            )
+            project__id__exact=project_id,
+        ).with_project_code()
         return queryset
 
     def get_serializer_context(self):
@@ -209,26 +329,100 @@ class ListDeveloperTasksInProject(ListAPIView):
         context["fields"] = True
         return context
 
-    @method_decorator(cache_page(60 * 30, key_prefix="task"))
-    @method_decorator(vary_on_cookie)
+    def is_cursor_request(self):
+        cursor = getattr(self.paginator, "cursor_query_param", None)
+        return cursor in self.request.query_params
+
+    def get_etag_probe(self):
+        probe = super().get_etag_probe()
+        # Conditional requests without tasks get the 404 response, not a
+        # 304 response for an empty list.
+        if probe["count"] == 0 and not self.is_cursor_request():
+            raise Http404(self.not_found_message)
+        return probe
+
+    @method_decorator(
+        cache_page(60 * 30, "developer", "developer:{developer_id}")
+    )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        # The queryset is evaluated once, the 404 comes from the loaded
+        # tasks instead of a previous exists() query.
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        tasks = list(queryset) if page is None else page
+        if not tasks and not self.is_cursor_request():
+            raise Http404(self.not_found_message)
+        serializer = self.get_serializer(tasks, many=True)
+        if page is not None:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response(serializer.data)
+        return self.set_loaded_conditional_headers(queryset, tasks, response)
 
 
 class ListAvailableDevelopers(ListAPIView):
-    serializer_class = UserSerializer
-    queryset = User.objects.filter(
-        tasks__isnull=True, role__exact="D", is_active=True, deleted=False
-    )
+    """Developers ranked by their number of open tasks, least busy first
+
+    ?max_open=N (default 0) keeps developers with at most N open tasks and
+    ?limit=N returns only the first N of them.
+    """
+
+    serializer_class = AvailableDeveloperSerializer
     permission_classes = [permissions.IsAdminUser | IsProjectManager]
+    # Ranked lists are cut with ?limit= instead of keyset pages.
+    pagination_class = None
+
+    def get_non_negative_int(self, name, default):
+        value = self.request.query_params.get(name, default)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            value = -1
+        if value < 0:
+            raise ValidationError(
+                {name: ["A non negative integer is required"]}
+            )
+        return value
 
-    @method_decorator(cache_page(60 * 30, key_prefix="user"))
-    @method_decorator(vary_on_cookie)
+    def get_queryset(self):
+        max_open = self.get_non_negative_int("max_open", 0)
+        # Both subqueries are answered by task_active_dev_done_idx.
+        open_tasks = Task.objects.filter(
+            developer=OuterRef("pk"),
+            is_active=True,
+            is_deleted=False,
+            is_completed=False,
+        )
+        queryset = User.objects.filter(
+            role__exact="D", is_active=True, deleted=False
+        )
+        if max_open == 0:
+            queryset = queryset.filter(~Exists(open_tasks)).annotate(
+                open_tasks=Value(0)
+            )
+        else:
+            count = (
+                open_tasks.order_by()
+                .values("developer")
+                .annotate(count=Count("id"))
+                .values("count")
+            )
+            queryset = queryset.annotate(
+                open_tasks=Coalesce(Subquery(count), 0)
+            ).filter(open_tasks__lte=max_open)
+        queryset = queryset.order_by("open_tasks", "-creation_date", "-id")
+        if "limit" in self.request.query_params:
+            limit = self.get_non_negative_int("limit", None)
+            queryset = queryset[: min(limit, settings.MAX_PAGE_SIZE)]
+        return queryset
+
+    # Cleared by both task and user changes, the list depends on both.
+    @method_decorator(cache_page(60 * 30, "tasks", "users"))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class EnableProject(UpdateAPIView):
+class EnableProject(StateTransitionMixin, UpdateAPIView):
     serializer_class = ProjectSerializer
     queryset = Project.objects.filter(is_active=False, is_deleted=False)
     permission_classes = [permissions.IsAdminUser | IsProjectManager]
@@ -240,11 +434,12 @@ class EnableProject(UpdateAPIView):
         return context
 
     def update(self, request, *args, **kwargs):
-        project = self.get_object()
-        project.is_active = True
-        project.save()
+        counts = self.perform_transition(
+            {"is_active": True},
+            task_filter={"is_active": False, "is_deleted": False},
+        )
         return Response(
-            {"Response": "Project was successfully added"},
+            {"Response": "Project was successfully added", **counts},
             status=status.HTTP_200_OK,
         )
 
@@ -252,7 +447,7 @@ class EnableProject(UpdateAPIView):
         raise MethodNotAllowed("Partial updates are not allowed")
 
 
-class DisableProject(DestroyAPIView):
+class DisableProject(StateTransitionMixin, DestroyAPIView):
     serializer_class = ProjectSerializer
     queryset = Project.objects.filter(is_active=True, is_deleted=False)
     permission_classes = [permissions.IsAdminUser | IsProjectManager]
@@ -264,16 +459,40 @@ class DisableProject(DestroyAPIView):
         return context
 
     def destroy(self, request, *args, **kwargs):
-        project = self.get_object()
-        project.is_active = False
-        project.save()
+        counts = self.perform_transition(
+            {"is_active": False},
+            task_filter={"is_active": True, "is_deleted": False},
+        )
         return Response(
-            {"Response": "Project was successfully disabled"},
+            {"Response": "Project was successfully disabled", **counts},
             status=status.HTTP_204_NO_CONTENT,
         )
 
 
-class EnableTask(UpdateAPIView):
+class RetrieveProjectStats(GenericAPIView):
+    serializer_class = ProjectStatsSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        code = self.kwargs["code"]
+        project_id = Project.objects.get_id_by_code(code)
+        stats = None
+        if project_id is not None:
+            # Cached by project id, so task changes can clear the stats of
+            # their project without knowing its code.
+            key = project_stats_cache_key(project_id)
+            stats = cache.get(key)
+            if stats is None:
+                stats = Project.objects.get_stats(project_id)
+                if stats is not None:
+                    cache.set(key, stats, timeout=60 * 30)
+        if stats is None:
+            raise Http404("No Project matches the given query.")
+        serializer = self.get_serializer({"code": code, **stats})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class EnableTask(StateTransitionMixin, UpdateAPIView):
     serializer_class = TaskSerializer
     queryset = Task.objects.filter(is_active=False, is_deleted=False)
     permission_classes = [permissions.IsAdminUser | IsProjectManager]
@@ -285,11 +504,9 @@ class EnableTask(UpdateAPIView):
         return context
 
     def update(self, request, *args, **kwargs):
-        task = self.get_object()
-        task.is_active = True
-        task.save()
+        counts = self.perform_transition({"is_active": True})
         return Response(
-            {"Response": "Task was successfully added"},
+            {"Response": "Task was successfully added", **counts},
             status=status.HTTP_200_OK,
         )
 
@@ -297,7 +514,7 @@ class EnableTask(UpdateAPIView):
         raise MethodNotAllowed("Partial updates are not allowed")
 
 
-class DisableTask(DestroyAPIView):
+class DisableTask(StateTransitionMixin, DestroyAPIView):
     serializer_class = TaskSerializer
     queryset = Task.objects.filter(is_active=True, is_deleted=False)
     permission_classes = [permissions.IsAdminUser | IsProjectManager]
@@ -309,10 +526,68 @@ class DisableTask(DestroyAPIView):
         return context
 
     def destroy(self, request, *args, **kwargs):
-        task = self.get_object()
-        task.is_active = False
-        task.save()
+        counts = self.perform_transition({"is_active": False})
         return Response(
-            {"Response": "Task was successfully disabled"},
+            {"Response": "Task was successfully disabled", **counts},
             status=status.HTTP_204_NO_CONTENT,
         )
+
+
+class ListProjectDashboard(ListAPIView):
+    # Rows come from a materialized view refreshed by a periodic task.
+    queryset = ProjectDashboard.objects.all()
+    serializer_class = ProjectDashboardSerializer
+    permission_classes = [permissions.IsAdminUser | IsProjectManager]
+
+
+class SyncChanges(GenericAPIView):
+    """Projects and tasks changed since ?updated_since=, with a watermark
+
+    Disabled and deleted rows are returned as tombstones, so clients can
+    remove them. Without updated_since only the active rows are returned.
+    All the rows are read from one snapshot, and the watermark is moved
+    back SYNC_WATERMARK_OVERLAP seconds, so changes committed after the
+    snapshot by transactions already running are in the next sync. Clients
+    can receive the same change twice.
+    """
+
+    serializer_class = SyncSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = True
+        return context
+
+    def get_changes(self, model, since):
+        queryset = model.objects.all()
+        if since is None:
+            return queryset.filter(is_active=True, is_deleted=False).order_by(
+                "updated_at", "pk"
+            )
+        return queryset.changed_since(since)
+
+    def get(self, request, *args, **kwargs):
+        query = SyncQuerySerializer(data=request.query_params.dict())
+        query.is_valid(raise_exception=True)
+        since = query.validated_data.get("updated_since")
+        with repeatable_read():
+            # The first query takes the snapshot of the transaction.
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT statement_timestamp()")
+                snapshot_at = cursor.fetchone()[0]
+            projects = list(self.get_changes(Project, since))
+            tasks = list(self.get_changes(Task, since).with_project_code())
+        overlap = timedelta(seconds=settings.SYNC_WATERMARK_OVERLAP)
+        serializer = self.get_serializer(
+            {
+                "watermark": snapshot_at - overlap,
+                "projects": [row for row in projects if row.is_listed],
+                "tasks": [row for row in tasks if row.is_listed],
+                "removed_projects": [
+                    row for row in projects if not row.is_listed
+                ],
+                "removed_tasks": [row for row in tasks if not row.is_listed],
+            }
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)